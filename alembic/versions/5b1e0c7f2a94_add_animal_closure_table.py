@@ -0,0 +1,51 @@
+"""add_animal_closure_table
+
+Revision ID: 5b1e0c7f2a94
+Revises: a6255a658dc9
+Create Date: 2026-10-17 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e0c7f2a94'
+down_revision: Union[str, None] = 'a6255a658dc9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'animal_closure',
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['animals.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['animals.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index(op.f('ix_animal_closure_descendant_id'), 'animal_closure', ['descendant_id'], unique=False)
+
+    # Backfill every existing (ancestor, descendant) path, self pairs included.
+    op.execute("""
+        WITH RECURSIVE paths AS (
+            SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth
+            FROM animals
+            UNION ALL
+            SELECT a.ancestor_id, p.descendant_id, p.depth + 1
+            FROM paths p
+            INNER JOIN animals a ON a.id = p.ancestor_id
+            WHERE a.ancestor_id IS NOT NULL
+        )
+        INSERT INTO animal_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM paths;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_animal_closure_descendant_id'), table_name='animal_closure')
+    op.drop_table('animal_closure')
@@ -0,0 +1,29 @@
+"""add_name_trigram_indexes
+
+Revision ID: f3b8d2a61c94
+Revises: e91a3c5d7b20
+Create Date: 2026-10-17 14:05:42.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2a61c94'
+down_revision: Union[str, None] = 'e91a3c5d7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_animals_name_trgm', 'animals', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_animals_scientific_name_trgm', 'animals', ['scientific_name'], unique=False, postgresql_using='gin', postgresql_ops={'scientific_name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_animals_scientific_name_trgm', table_name='animals', postgresql_using='gin')
+    op.drop_index('ix_animals_name_trgm', table_name='animals', postgresql_using='gin')
+    # pg_trgm is left installed; other objects may depend on it.
@@ -0,0 +1,48 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.db.models import EnrichmentJob
+from app.schemas.job import EnrichmentJobRead, QueueStats
+from app.services.job_queue import job_queue
+from app.utils import get_or_404
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+# ── QUEUE DEPTH ──────────────────────────────────────────────────────────────
+@router.get("/stats", response_model=QueueStats)
+async def get_queue_stats():
+    by_kind = await job_queue.stats()
+    depth = sum(
+        count
+        for statuses in by_kind.values()
+        for status, count in statuses.items()
+        if status in ("pending", "running")
+    )
+    return QueueStats(depth=depth, by_kind=by_kind)
+
+
+# ── LIST / READ ──────────────────────────────────────────────────────────────
+@router.get("/", response_model=List[EnrichmentJobRead])
+async def list_jobs(
+    status: Optional[str] = None,
+    animal_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    stmt = select(EnrichmentJob).order_by(EnrichmentJob.id.desc()).limit(limit)
+    if status is not None:
+        stmt = stmt.where(EnrichmentJob.status == status)
+    if animal_id is not None:
+        stmt = stmt.where(EnrichmentJob.animal_id == animal_id)
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+@router.get("/{job_id}", response_model=EnrichmentJobRead)
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    return await get_or_404(db, EnrichmentJob, job_id)
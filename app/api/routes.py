@@ -1,116 +1,344 @@
-from typing import List
-
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
-from sqlalchemy import select, text
+import io
+import uuid
+from typing import AsyncIterator, Iterable, List, Literal, Optional, Union
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import Select, TextClause, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.metrics import stage_timer
+from app.db.closure import (
+    LINEAGE_QUERY,
+    SUBTREE_QUERY,
+    contract_node,
+    delete_subtree,
+    detach_subtree,
+    link_node,
+)
+from app.db.database import AsyncSessionLocal, ReadSessionLocal, get_db, get_read_db
+from app.db.hierarchy import insert_nodes, lookup_names, resolve_hierarchy
 from app.db.models import Animal
+from app.db.search import FUZZY_SEARCH_QUERY, SET_SIMILARITY_THRESHOLD
 from app.schemas.animal import (
     AnimalCreate,
     AnimalCreateResponse,
     AnimalLineageItem,
     AnimalRead,
+    AnimalSearchHit,
+    AnimalSearchResponse,
+    BulkImportReport,
+    BulkImportRequest,
+    GraphLayoutResponse,
+    GraphResponse,
+    LCABatchMatrixResponse,
+    LCABatchPairsResponse,
+    LCABatchRequest,
     LCAResponse,
     LineageResponse,
+    RelativeItem,
+    RelativesResponse,
+    SubtreeNode,
+    TreeImportResponse,
 )
-from app.services.ai_service import generate_fun_fact
+from app.services.bulk_import import import_animals, parse_names
+from app.services.enrichment import enqueue_job
+from app.services.event_bus import event_bus
 from app.services.external_api import fetch_animal_data
-from app.services.image_service import fetch_animal_image_url
-from app.utils import get_or_404
+from app.services.graph_layout import graph_layout
+from app.services.job_queue import job_queue
+from app.services.name_index import name_index
+from app.services.relatives import relatives_index
+from app.services.response_cache import clear_responses, generation, invalidate_animals, response_cache, store
+from app.services.singleflight import SingleFlight
+from app.services.taxonomy_index import pairwise_lca, taxonomy_index
+from app.services.tree_io import (
+    TreeNotEmptyError,
+    decode_binary,
+    encode_binary,
+    fetch_tree,
+    load_tree,
+    newick_chunks,
+    parse_newick,
+)
+from app.utils import get_or_404, normalize_name, rows_to_json
 
 router = APIRouter(prefix="/animals", tags=["Animals"])
 
+# Distinguishes this process's index versions from another worker's/restart's.
+_GRAPH_ETAG_SALT = uuid.uuid4().hex[:8]
+
+
+# ── IN-MEMORY INDEXES ────────────────────────────────────────────────────────
+async def _rebuild_indexes(db: AsyncSession) -> None:
+    """Reloads the taxonomy and name indexes together, so they always cover the same rows."""
+    await taxonomy_index.rebuild(db)
+    await name_index.rebuild(db)
+
+
+_reload_flight = SingleFlight()
+
+
+async def _reload_indexes() -> None:
+    async with AsyncSessionLocal() as primary:
+        await _rebuild_indexes(primary)
+
+
+async def _ensure_indexed(animal_ids: Iterable[int] = ()) -> None:
+    """
+    An id unknown to this process is either a real 404 or a row written by
+    another worker, in which case the indexes are stale; so is an index that
+    could not place a new node under its parent. Reloaded from the primary
+    so replica lag cannot shrink them; concurrent reloads are coalesced.
+    """
+    missing = [animal_id for animal_id in animal_ids if animal_id not in taxonomy_index]
+    if not missing and not taxonomy_index.stale:
+        return
+    await _reload_flight.do("indexes", _reload_indexes)
+    missing = [animal_id for animal_id in missing if animal_id not in taxonomy_index]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Animal id={missing[0]} not found." if len(missing) == 1 else f"Animal ids not found: {missing}",
+        )
+
 
 # ── CREATE ───────────────────────────────────────────────────────────────────
+_create_flight = SingleFlight()
+
+
 @router.post("/", response_model=AnimalCreateResponse, status_code=status.HTTP_201_CREATED)
-async def create_animal(
-    body: AnimalCreate,
-    background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db),
-):
+async def create_animal(body: AnimalCreate):
     animal_name = body.name.strip().title()
+    # Concurrent creates of the same name share one pipeline run and its
+    # result (or error) instead of racing each other into 409s.
+    return await _create_flight.do(normalize_name(animal_name), lambda: _create_animal(animal_name))
+
+
+async def _create_animal(animal_name: str) -> AnimalCreateResponse:
+    # Own session: the pipeline may outlive the request that started it.
+    async with AsyncSessionLocal() as db:
+        with stage_timer("fetch_taxonomy"):
+            api_data = await fetch_animal_data(animal_name)
+        if not api_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No animal found on API Ninjas for '{animal_name}'. "
+                       f"Try a different name or an English scientific name.",
+            )
+
+        hierarchy = api_data.get("taxonomy_hierarchy", [])
+        leaf_name = api_data.get("proper_name") or animal_name
+
+        # One round trip for the duplicate check and every hierarchy level.
+        with stage_timer("lookup_names"):
+            known = await lookup_names(db, hierarchy + [leaf_name])
+        if leaf_name in known:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"'{leaf_name}' is already registered in the database.",
+            )
+
+        with stage_timer("resolve_hierarchy"):
+            current_parent_id, chain_ids, new_nodes = await resolve_hierarchy(db, hierarchy, known)
+
+        leaf_fields = {
+            "scientific_name": api_data.get("scientific_name"),
+            "taxonomy_class":  api_data.get("taxonomy_class"),
+            "locations":       api_data.get("locations"),
+            "temperament":     api_data.get("temperament"),
+            "lifespan":        api_data.get("lifespan"),
+            "weight":          api_data.get("weight"),
+        }
+        with stage_timer("insert_leaf"):
+            if leaf_name in chain_ids:
+                # The species name doubles as one of its own taxa: promote that node.
+                leaf_id = chain_ids[leaf_name]
+                await db.execute(update(Animal).where(Animal.id == leaf_id).values(**leaf_fields))
+            else:
+                row_ids, inserted = await insert_nodes(
+                    db, [{"name": leaf_name, "ancestor_id": current_parent_id, **leaf_fields}]
+                )
+                if not inserted:
+                    await db.rollback()
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"'{leaf_name}' is already registered in the database.",
+                    )
+                leaf_id = row_ids[leaf_name]
+                await link_node(db, leaf_id, current_parent_id)
+                new_nodes.append((leaf_id, current_parent_id))
+
+            await enqueue_job(db, leaf_id, "image")
+            await enqueue_job(db, leaf_id, "fun_fact")
+
+        with stage_timer("commit"):
+            await db.commit()
+        leaf_animal = await db.get(Animal, leaf_id, populate_existing=True)
+
+        for node_id, parent_id in new_nodes:
+            taxonomy_index.add(node_id, parent_id)
+        if not new_nodes:
+            taxonomy_index.touch()
+        taxon_names = {node_id: name for name, node_id in chain_ids.items()}
+        for node_id, _ in new_nodes:
+            if node_id in taxon_names:
+                name_index.add(node_id, taxon_names[node_id])
+        name_index.add(leaf_id, leaf_animal.name, leaf_animal.scientific_name)
+        invalidate_animals([leaf_id])
+        added = [
+            (node_id, taxon_names[node_id], False)
+            for node_id, _ in new_nodes if node_id in taxon_names and node_id != leaf_id
+        ] + [(leaf_id, leaf_animal.name, True)]
+        event_bus.publish("added", nodes=[
+            {"id": node_id, "name": name, "ancestor_id": taxonomy_index.parent(node_id), "is_leaf": is_leaf}
+            for node_id, name, is_leaf in added
+        ])
+
+        job_queue.notify()
+
+        full_path = " → ".join(hierarchy) + f" → {leaf_name}"
+        return AnimalCreateResponse(
+            animal=AnimalRead.model_validate(leaf_animal),
+            background_task_status=f"'{leaf_animal.name}' added! Hierarchy: {full_path}",
+        )
+
 
-    api_data = await fetch_animal_data(animal_name)
-    if not api_data:
+# ── BULK CREATE ──────────────────────────────────────────────────────────────
+_BULK_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "text/plain": "txt",
+}
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkImportReport,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": BulkImportRequest.model_json_schema()},
+        **{content_type: {"schema": {"type": "string"}} for content_type in _BULK_CONTENT_TYPES},
+    }}},
+)
+async def bulk_create_animals(request: Request, concurrency: int = Query(8, ge=1, le=32)):
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip()
+    raw = await request.body()
+    try:
+        if content_type == "application/json":
+            names = BulkImportRequest.model_validate_json(raw).names
+        elif content_type in _BULK_CONTENT_TYPES:
+            names = parse_names(raw.decode("utf-8"), _BULK_CONTENT_TYPES[content_type])
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Send JSON or one of: {list(_BULK_CONTENT_TYPES)}",
+            )
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    if len(names) > 10000:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No animal found on API Ninjas for '{animal_name}'. "
-                   f"Try a different name or an English scientific name.",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="At most 10000 names per request; use `python -m app.cli import` for larger files.",
         )
 
-    hierarchy = api_data.get("taxonomy_hierarchy", [])
-    leaf_name = api_data.get("proper_name") or animal_name
+    report = await import_animals(names, concurrency=concurrency)
+    job_queue.notify()
+    return report
 
-   
 
- 
-    pre_check = await db.execute(select(Animal).where(Animal.name == leaf_name))
-    if pre_check.scalars().first() is not None:
+# ── READ ALL ─────────────────────────────────────────────────────────────────
+def _listing_columns(fields: Optional[str]) -> list:
+    if not fields:
+        return [getattr(Animal, name) for name in AnimalRead.model_fields]
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in AnimalRead.model_fields]
+    if unknown:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"'{leaf_name}' is already registered in the database.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {unknown}. Allowed: {list(AnimalRead.model_fields)}",
         )
+    # id is the pagination cursor and name is required by AnimalRead.
+    names = ["id", "name"] + [f for f in requested if f not in ("id", "name")]
+    return [getattr(Animal, name) for name in names]
 
-   
-    current_parent_id: int | None = None
-    for taxon_name in hierarchy:
-        result = await db.execute(select(Animal).where(Animal.name == taxon_name))
-        existing = result.scalars().first()
-        if existing:
-            current_parent_id = existing.id
-        else:
-            node = Animal(name=taxon_name, ancestor_id=current_parent_id)
-            db.add(node)
-            await db.flush()
-            current_parent_id = node.id
-
-   
-    result = await db.execute(select(Animal).where(Animal.name == leaf_name))
-    existing_as_taxon = result.scalars().first()
-
-    image_url = await fetch_animal_image_url(leaf_name)
-
-    if existing_as_taxon:
-        leaf_animal = existing_as_taxon
-        leaf_animal.scientific_name = api_data.get("scientific_name")
-        leaf_animal.taxonomy_class  = api_data.get("taxonomy_class")
-        leaf_animal.locations       = api_data.get("locations")
-        leaf_animal.lifespan        = api_data.get("lifespan")
-        leaf_animal.weight          = api_data.get("weight")
-        leaf_animal.image_url       = image_url
-    else:
-        leaf_animal = Animal(
-            name=leaf_name,
-            ancestor_id=current_parent_id,
-            scientific_name=api_data.get("scientific_name"),
-            taxonomy_class=api_data.get("taxonomy_class"),
-            locations=api_data.get("locations"),
-            temperament=api_data.get("temperament"),
-            lifespan=api_data.get("lifespan"),
-            weight=api_data.get("weight"),
-            image_url=image_url,
-        )
-        db.add(leaf_animal)
-        await db.flush()
 
-    await db.commit()
-    await db.refresh(leaf_animal)
+async def _stream_ndjson(stmt: Select | TextClause, params: Optional[dict] = None) -> AsyncIterator[bytes]:
+    # Own session: the request-scoped one is closed before the body streams.
+    async with ReadSessionLocal() as session:
+        result = await session.stream(stmt, params, execution_options={"yield_per": 500})
+        keys = list(result.keys())
+        async for rows in result.partitions():
+            yield b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
 
-    background_tasks.add_task(generate_fun_fact, leaf_animal.name, leaf_animal.id, leaf_animal.taxonomy_class)
 
-    full_path = " → ".join(hierarchy) + f" → {leaf_name}"
-    return AnimalCreateResponse(
-        animal=AnimalRead.model_validate(leaf_animal),
-        background_task_status=f"'{leaf_animal.name}' added! Hierarchy: {full_path}",
-    )
+def _json(body: bytes, headers: Optional[dict[str, str]] = None) -> Response:
+    """Pre-serialized body; bypasses `response_model` validation and encoding."""
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
-# ── READ ALL ─────────────────────────────────────────────────────────────────
-@router.get("/", response_model=List[AnimalRead])
-async def list_animals(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Animal))
-    return result.scalars().all()
+@router.get("/", response_model=List[AnimalRead], response_model_exclude_unset=True)
+async def list_animals(
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_read_db),
+):
+    stmt = select(*_listing_columns(fields)).order_by(Animal.id)
+    if after_id is not None:
+        stmt = stmt.where(Animal.id > after_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    if format == "ndjson":
+        return StreamingResponse(_stream_ndjson(stmt), media_type="application/x-ndjson")
+
+    result = await db.execute(stmt)
+    keys, rows = list(result.keys()), result.all()
+    headers = {}
+    if limit is not None and len(rows) == limit:
+        headers["X-Next-After-Id"] = str(rows[-1].id)
+    # Every listed column is JSON-native, so rows go straight to bytes.
+    return _json(rows_to_json(keys, rows), headers)
+
+
+# ── SEARCH ───────────────────────────────────────────────────────────────────
+@router.get("/search", response_model=AnimalSearchResponse)
+async def search_animals(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    fuzzy: bool = True,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Prefix matches on any word of `name` / `scientific_name` come from the
+    in-process name index; if they don't fill `limit`, trigram matches
+    from Postgres (typo-tolerant) are appended.
+    """
+    results = [
+        AnimalSearchHit(id=animal_id, name=name, scientific_name=scientific_name, match="prefix", score=1.0)
+        for animal_id in name_index.prefix(q, limit)
+        for name, scientific_name in [name_index.names(animal_id)]
+    ]
+    if fuzzy and len(results) < limit and len(normalize_name(q)) >= 3:
+        await db.execute(SET_SIMILARITY_THRESHOLD, {"threshold": str(settings.SEARCH_FUZZY_THRESHOLD)})
+        rows = (await db.execute(FUZZY_SEARCH_QUERY, {"q": q, "limit": limit})).fetchall()
+        seen = {hit.id for hit in results}
+        results += [
+            AnimalSearchHit(
+                id=row.id, name=row.name, scientific_name=row.scientific_name,
+                match="fuzzy", score=round(row.score, 3),
+            )
+            for row in rows
+            if row.id not in seen
+        ][:limit - len(results)]
+    return AnimalSearchResponse(query=q, results=results)
 
 
 # ── LCA (LOWEST COMMON ANCESTOR) ─────────────────────────────────────────────
@@ -118,45 +346,24 @@ async def list_animals(db: AsyncSession = Depends(get_db)):
 async def get_common_ancestor(
     animal1_id: int,
     animal2_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    a1 = await get_or_404(db, Animal, animal1_id)
-    a2 = await get_or_404(db, Animal, animal2_id)
+    await _ensure_indexed((animal1_id, animal2_id))
     if animal1_id == animal2_id:
         raise HTTPException(status_code=400, detail="Both IDs are the same; please enter different animals.")
 
-    cte = text("""
-        WITH RECURSIVE lineage AS (
-            SELECT id, name, ancestor_id, 0 AS depth
-            FROM animals WHERE id = :start_id
-            UNION ALL
-            SELECT a.id, a.name, a.ancestor_id, l.depth + 1
-            FROM animals a
-            INNER JOIN lineage l ON a.id = l.ancestor_id
-        )
-        SELECT id, name, ancestor_id, depth FROM lineage ORDER BY depth ASC;
-    """)
-
-    res1 = await db.execute(cte, {"start_id": animal1_id})
-    res2 = await db.execute(cte, {"start_id": animal2_id})
-    lineage1 = res1.fetchall()
-    lineage2 = res2.fetchall()
-
-    ancestors_of_1: dict[int, int] = {row.id: row.depth for row in lineage1}
-    lca_row = None
-    lca_distance_from_2 = None
-
-    for row in lineage2:
-        if row.id in ancestors_of_1:
-            lca_row = row
-            lca_distance_from_2 = row.depth
-            break
-
-    if not lca_row:
+    distances = taxonomy_index.distances(animal1_id, animal2_id)
+    if distances is None:
         raise HTTPException(status_code=404, detail="No common ancestor found for these two animals.")
 
-    lca_distance_from_1 = ancestors_of_1[lca_row.id]
-    lca_animal = await db.get(Animal, lca_row.id)
+    lca_id, lca_distance_from_1, lca_distance_from_2 = distances
+    lca_animal = await db.get(Animal, lca_id)
+    if lca_animal is None:
+        # The index follows the primary; a lagging replica may not have the row yet.
+        async with AsyncSessionLocal() as primary:
+            lca_animal = await primary.get(Animal, lca_id)
+    if lca_animal is None:
+        raise HTTPException(status_code=404, detail="No common ancestor found for these two animals.")
 
     return LCAResponse(
         common_ancestor=AnimalRead.model_validate(lca_animal),
@@ -166,47 +373,317 @@ async def get_common_ancestor(
     )
 
 
+@router.post(
+    "/common-ancestor/batch",
+    response_model=Union[LCABatchMatrixResponse, LCABatchPairsResponse],
+)
+async def get_common_ancestor_batch(
+    body: LCABatchRequest,
+    format: Literal["matrix", "pairs", "npz"] = "matrix",
+):
+    await _ensure_indexed(body.ids)
+
+    # The snapshot is taken here, on the event loop, while nothing can mutate
+    # the index; only the numpy lifting over it runs in the threadpool.
+    lca, dist = await run_in_threadpool(pairwise_lca, *taxonomy_index.lca_inputs(body.ids))
+
+    if format == "npz":
+        buffer = io.BytesIO()
+        np.savez(buffer, ids=np.array(body.ids, dtype=np.int64), common_ancestor_ids=lca, distances=dist)
+        return Response(
+            content=buffer.getvalue(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="common_ancestors.npz"'},
+        )
+    # Up to 2000² cells: encoded straight from the arrays, off the event loop.
+    return _json(await run_in_threadpool(_encode_lca_batch, body.ids, lca, dist, format))
+
+
+def _encode_lca_batch(ids: list[int], lca: np.ndarray, dist: np.ndarray, format: str) -> bytes:
+    """JSON for LCABatchMatrixResponse or LCABatchPairsResponse, without building models."""
+    if format == "matrix":
+        return orjson.dumps(
+            {"ids": ids, "common_ancestor_ids": lca, "distances": dist},
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+    rows, cols = np.triu_indices(len(ids), k=1)
+    id_array = np.array(ids, dtype=np.int64)
+    return orjson.dumps({"pairs": [
+        {
+            "animal1_id": animal1_id,
+            "animal2_id": animal2_id,
+            "common_ancestor_id": ancestor if ancestor >= 0 else None,
+            "total_distance": distance if distance >= 0 else None,
+        }
+        for animal1_id, animal2_id, ancestor, distance in zip(
+            id_array[rows].tolist(), id_array[cols].tolist(),
+            lca[rows, cols].tolist(), dist[rows, cols].tolist(),
+        )
+    ]})
+
+
+# ── GRAPH (COMPACT TOPOLOGY) ─────────────────────────────────────────────────
+@router.get("/graph", response_model=GraphResponse)
+async def get_graph(request: Request, db: AsyncSession = Depends(get_db)):
+    version = taxonomy_index.version
+    etag = f'W/"{_GRAPH_ETAG_SALT}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    result = await db.execute(
+        select(Animal.id, Animal.name, Animal.ancestor_id, Animal.scientific_name.is_not(None))
+        .order_by(Animal.id)
+    )
+    rows = result.tuples().all()
+    ids, names, ancestor_ids, is_leaf = (list(col) for col in zip(*rows)) if rows else ([], [], [], [])
+    return _json(orjson.dumps({
+        "version": version, "ids": ids, "names": names, "ancestor_ids": ancestor_ids, "is_leaf": is_leaf,
+    }), headers)
+
+
+@router.get("/graph/layout", response_model=GraphLayoutResponse)
+async def get_graph_layout(request: Request, mode: Literal["tree", "radial"] = "tree"):
+    """
+    Server-computed x/y for every node of /animals/graph, so the client can
+    render with physics and its own layout engine off.
+    """
+    await _ensure_indexed()
+    etag = f'W/"{_GRAPH_ETAG_SALT}-{taxonomy_index.version}-{mode}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return _json(orjson.dumps(graph_layout.coordinates(mode)), headers)
+
+
+# ── CHANGE FEED (SERVER-SENT EVENTS) ─────────────────────────────────────────
+@router.get("/events", response_class=StreamingResponse, responses={200: {"content": {"text/event-stream": {}}}})
+async def stream_events(last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")):
+    """
+    Incremental tree changes (added, deleted, fun_fact, image, reset) as
+    SSE. Each event's id is `<process epoch>-<version>`; browsers resend the
+    last one on reconnect and get the missed events replayed, or `reset` if
+    too old, unparseable or from another process.
+    """
+    return StreamingResponse(
+        event_bus.stream(last_event_id or None, settings.EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ── EXPORT / IMPORT (WHOLE TREE) ─────────────────────────────────────────────
+@router.get("/export", response_class=Response, responses={200: {"content": {
+    "text/x-nh": {}, "application/octet-stream": {},
+}}})
+async def export_tree(
+    format: Literal["newick", "binary"] = "newick",
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The whole forest as Newick (streamed) or an EVOT binary snapshot (see app.services.tree_io)."""
+    rows = await fetch_tree(db)
+    if format == "binary":
+        return Response(
+            content=await run_in_threadpool(encode_binary, rows),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="evograph.evot"'},
+        )
+    # A sync generator: Starlette iterates it in the threadpool.
+    return StreamingResponse(
+        newick_chunks(rows),
+        media_type="text/x-nh",
+        headers={"Content-Disposition": 'attachment; filename="evograph.nwk"'},
+    )
+
+
+@router.post(
+    "/import",
+    response_model=TreeImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+        "text/x-nh": {"schema": {"type": "string"}},
+    }}},
+)
+async def import_tree(request: Request, format: Literal["newick", "binary"] = "binary", replace: bool = False):
+    """
+    Bulk-loads a whole tree with COPY and rebuilds the closure table.
+    Refuses a non-empty database unless `replace=true`, which wipes it.
+    """
+    raw = await request.body()
+    try:
+        if format == "binary":
+            rows = await run_in_threadpool(decode_binary, raw)
+        else:
+            rows = await run_in_threadpool(parse_newick, raw.decode("utf-8"))
+        imported = await load_tree(rows, replace=replace)
+    except TreeNotEmptyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:  # includes UnicodeDecodeError
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    async with AsyncSessionLocal() as session:
+        await _rebuild_indexes(session)
+    clear_responses()
+    event_bus.publish("reset")
+    return TreeImportResponse(imported=imported)
+
+
 # ── READ ONE ─────────────────────────────────────────────────────────────────
 @router.get("/{animal_id}", response_model=AnimalRead)
 async def get_animal(animal_id: int, db: AsyncSession = Depends(get_db)):
-    return await get_or_404(db, Animal, animal_id)
+    # Misses are filled from the primary: writes invalidate these keys right
+    # after committing there, and a lagging replica would re-cache the old row.
+    key = ("animal", animal_id)
+    body = response_cache.get(key)
+    if body is None:
+        fill_generation = generation(animal_id)
+        body = AnimalRead.model_validate(await get_or_404(db, Animal, animal_id)).model_dump_json().encode()
+        store(key, body, fill_generation)
+    return _json(body)
 
 
 # ── DELETE ────────────────────────────────────────────────────────────────────
 @router.delete("/{animal_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_animal(animal_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_animal(
+    animal_id: int,
+    mode: Literal["orphan", "cascade", "reparent"] = "orphan",
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    `orphan` (default) leaves the children as new roots, `cascade` deletes
+    the whole subtree and `reparent` attaches the children to this node's
+    own ancestor. Each mode is a fixed number of set-based statements.
+    """
     animal = await get_or_404(db, Animal, animal_id)
-    await db.delete(animal)
+    # Every descendant's lineage ran through this node; its children also get a new ancestor_id.
+    affected = taxonomy_index.subtree(animal_id) if animal_id in taxonomy_index else [animal_id]
+    children = taxonomy_index.children(animal_id) if animal_id in taxonomy_index else []
+
+    if mode == "cascade":
+        affected = await delete_subtree(db, animal_id)
+    else:
+        if mode == "reparent":
+            await contract_node(db, animal_id)
+            await db.execute(
+                update(Animal)
+                .where(Animal.ancestor_id == animal_id)
+                .values(ancestor_id=animal.ancestor_id)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            await detach_subtree(db, animal_id)
+        await db.execute(delete(Animal).where(Animal.id == animal_id))
     await db.commit()
 
+    if mode == "cascade":
+        taxonomy_index.remove_subtree(animal_id)
+    else:
+        taxonomy_index.remove(animal_id, reparent=mode == "reparent")
+    deleted_ids = affected if mode == "cascade" else [animal_id]
+    for deleted_id in deleted_ids:
+        name_index.remove(deleted_id)
+    invalidate_animals(affected)
+    new_ancestor = animal.ancestor_id if mode == "reparent" else None
+    event_bus.publish("deleted", ids=deleted_ids, reparented=[
+        [child_id, new_ancestor] for child_id in (children if mode != "cascade" else [])
+    ])
+
 
 # ── LINEAGE (FAMILY TREE) ─────────────────────────────────────────────────────
 @router.get("/{animal_id}/lineage", response_model=LineageResponse)
 async def get_lineage(animal_id: int, db: AsyncSession = Depends(get_db)):
+    # Primary for the same reason as get_animal: the result is cached.
+    key = ("lineage", animal_id)
+    body = response_cache.get(key)
+    if body is not None:
+        return _json(body)
+
+    fill_generation = generation(animal_id)
     origin = await get_or_404(db, Animal, animal_id)
 
-    cte_query = text("""
-        WITH RECURSIVE lineage AS (
-            SELECT id, name, ancestor_id, 0 AS depth
-            FROM animals WHERE id = :start_id
-            UNION ALL
-            SELECT a.id, a.name, a.ancestor_id, l.depth + 1
-            FROM animals a
-            INNER JOIN lineage l ON a.id = l.ancestor_id
-        )
-        SELECT id, name, ancestor_id, depth FROM lineage ORDER BY depth ASC;
-    """)
+    result = await db.execute(LINEAGE_QUERY, {"start_id": animal_id})
+    keys, rows = list(result.keys()), result.all()
 
-    result = await db.execute(cte_query, {"start_id": animal_id})
-    rows = result.fetchall()
+    body = orjson.dumps({
+        "animal_name": origin.name,
+        "total_generations": len(rows) - 1,
+        "lineage": [dict(zip(keys, row)) for row in rows],
+    })
+    store(key, body, fill_generation)
+    return _json(body)
 
-    lineage_items = [
-        AnimalLineageItem(id=row.id, name=row.name, ancestor_id=row.ancestor_id, depth=row.depth)
-        for row in rows
-    ]
 
-    return LineageResponse(
-        animal_name=origin.name,
-        total_generations=len(lineage_items) - 1,
-        lineage=lineage_items,
-    )
+# ── SUBTREE (DESCENDANTS) ─────────────────────────────────────────────────────
+_MAX_DEPTH = 2**31 - 1
+
+
+@router.get("/{animal_id}/subtree", response_model=Union[SubtreeNode, List[AnimalLineageItem]])
+async def get_subtree(
+    animal_id: int,
+    max_depth: Optional[int] = Query(None, ge=0),
+    format: Literal["nested", "flat", "ndjson"] = "nested",
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Everything below an animal, read from the closure table in one indexed
+    query. `flat`/`ndjson` rows carry `depth` relative to the root; `ndjson`
+    streams them without building the clade in memory.
+    """
+    await get_or_404(db, Animal, animal_id)
+    params = {"root_id": animal_id, "max_depth": _MAX_DEPTH if max_depth is None else max_depth}
+
+    if format == "ndjson":
+        return StreamingResponse(_stream_ndjson(SUBTREE_QUERY, params), media_type="application/x-ndjson")
+
+    result = await db.execute(SUBTREE_QUERY, params)
+    keys, rows = list(result.keys()), result.all()
+    if format == "flat":
+        return _json(rows_to_json(keys, rows))
+
+    nodes: dict[int, dict] = {}
+    for row in rows:
+        node = {"id": row.id, "name": row.name, "depth": row.depth, "children": []}
+        nodes[row.id] = node
+        if row.depth > 0:
+            nodes[row.ancestor_id]["children"].append(node)
+    return _json(orjson.dumps(nodes[animal_id]))
+
+
+# ── NEAREST RELATIVES ────────────────────────────────────────────────────────
+_MAX_RELATIVES = 1000
+
+
+@router.get("/{animal_id}/relatives", response_model=RelativesResponse)
+async def get_relatives(
+    animal_id: int,
+    k: Optional[int] = Query(None, ge=1, le=_MAX_RELATIVES),
+    max_distance: Optional[int] = Query(None, ge=1),
+):
+    """
+    The `k` closest species (10 by default), or every species within
+    `max_distance` steps (up to 1000), ranked by path distance through the
+    lowest common ancestor, then by deeper ancestor. Answered from memory.
+    """
+    await _ensure_indexed([animal_id])
+    if k is None:
+        k = 10 if max_distance is None else _MAX_RELATIVES
+
+    items = []
+    for relative in relatives_index.nearest(animal_id, k, max_distance):
+        # Relatives come from the name index, but a common ancestor can be a
+        # node another worker just wrote; skip rather than fail on it.
+        names, ancestor_names = name_index.get(relative.id), name_index.get(relative.common_ancestor_id)
+        if names is None or ancestor_names is None:
+            continue
+        items.append(RelativeItem(
+            id=relative.id,
+            name=names[0],
+            scientific_name=names[1],
+            common_ancestor_id=relative.common_ancestor_id,
+            common_ancestor_name=ancestor_names[0],
+            animal_distance=relative.animal_distance,
+            relative_distance=relative.relative_distance,
+            total_distance=relative.total_distance,
+        ))
+    return RelativesResponse(animal_id=animal_id, relatives=items)
@@ -0,0 +1,116 @@
+"""
+Command-line tools for EvoGraph.
+
+    python -m app.cli import species.csv [--format csv|jsonl|txt] [--concurrency 8]
+    python -m app.cli export tree.nwk [--format newick|binary]
+    python -m app.cli import-tree tree.evot [--format newick|binary] [--replace]
+
+import-tree writes straight to Postgres; restart running API processes
+afterwards so their in-memory indexes pick up the new tree.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+from app.db.database import AsyncSessionLocal, engine
+from app.services.bulk_import import import_animals, parse_names
+from app.services.http_clients import http_clients
+from app.services.tree_io import (
+    TreeNotEmptyError,
+    decode_binary,
+    encode_binary,
+    fetch_tree,
+    load_tree,
+    newick_chunks,
+    parse_newick,
+)
+
+_TREE_SUFFIXES = {".nwk": "newick", ".newick": "newick", ".tre": "newick", ".evot": "binary"}
+
+
+async def _import(args: argparse.Namespace) -> int:
+    fmt = args.format or {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(args.file.suffix, "txt")
+    names = parse_names(args.file.read_text(encoding="utf-8"), fmt)
+
+    await http_clients.open()
+    try:
+        report = await import_animals(names, concurrency=args.concurrency, chunk_size=args.chunk_size)
+    finally:
+        await http_clients.close()
+        await engine.dispose()
+
+    if args.report:
+        args.report.write_text(report.model_dump_json(indent=2), encoding="utf-8")
+    summary = {"total": report.total, "created": report.created, "failed": report.failed}
+    for item in report.items:
+        summary[item.status] = summary.get(item.status, 0) + 1
+    print(json.dumps(summary, indent=2))
+    return 0 if report.failed == 0 else 1
+
+
+async def _export(args: argparse.Namespace) -> int:
+    fmt = args.format or _TREE_SUFFIXES.get(args.file.suffix, "newick")
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = await fetch_tree(session)
+    finally:
+        await engine.dispose()
+    if fmt == "binary":
+        args.file.write_bytes(encode_binary(rows))
+    else:
+        with args.file.open("w", encoding="utf-8") as f:
+            f.writelines(newick_chunks(rows))
+    print(json.dumps({"exported": len(rows), "format": fmt, "file": str(args.file)}))
+    return 0
+
+
+async def _import_tree(args: argparse.Namespace) -> int:
+    fmt = args.format or _TREE_SUFFIXES.get(args.file.suffix, "binary")
+    try:
+        if fmt == "binary":
+            rows = decode_binary(args.file.read_bytes())
+        else:
+            rows = parse_newick(args.file.read_text(encoding="utf-8"))
+        imported = await load_tree(rows, replace=args.replace)
+    except (TreeNotEmptyError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        await engine.dispose()
+    print(json.dumps({"imported": imported, "format": fmt}))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="EvoGraph command-line tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    imp = commands.add_parser("import", help="Bulk-import animals from a CSV, JSONL or plain-text file.")
+    imp.add_argument("file", type=Path)
+    imp.add_argument("--format", choices=["csv", "jsonl", "txt"], help="Defaults to the file extension.")
+    imp.add_argument("--concurrency", type=int, default=8, help="Parallel API Ninjas lookups.")
+    imp.add_argument("--chunk-size", type=int, default=500, help="Names written per transaction.")
+    imp.add_argument("--report", type=Path, help="Write the per-item JSON report here.")
+    imp.set_defaults(handler=_import)
+
+    exp = commands.add_parser("export", help="Write the whole tree as Newick or an EVOT binary snapshot.")
+    exp.add_argument("file", type=Path)
+    exp.add_argument("--format", choices=["newick", "binary"], help="Defaults to the file extension (.nwk, .evot).")
+    exp.set_defaults(handler=_export)
+
+    load = commands.add_parser("import-tree", help="Bulk-load a Newick or EVOT tree with COPY.")
+    load.add_argument("file", type=Path)
+    load.add_argument("--format", choices=["newick", "binary"], help="Defaults to the file extension (.nwk, .evot).")
+    load.add_argument("--replace", action="store_true", help="Wipe existing animals (and their jobs) first.")
+    load.set_defaults(handler=_import_tree)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    return asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
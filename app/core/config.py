@@ -8,6 +8,51 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = ""  # https://aistudio.google.com/app/apikey
     UNSPLASH_ACCESS_KEY: str = ""  # https://unsplash.com/oauth/applications
 
+    # SQLAlchemy engine pool (app.db.database)
+    DATABASE_REPLICA_URL: str = ""  # optional read replica; reads may lag writes by replication delay
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # prepared statements per connection; 0 behind PgBouncer
+
+    # Shared outbound HTTP clients (app.services.http_clients)
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_RETRIES: int = 2
+    HTTP_BACKOFF_SECONDS: float = 0.5
+    API_NINJAS_CONCURRENCY: int = 10
+    UNSPLASH_CONCURRENCY: int = 10
+
+    # Read-through cache for GET /animals/{id} and /animals/{id}/lineage
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+
+    # Enrichment job queue (app.services.job_queue)
+    JOB_WORKERS: int = 4
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_SECONDS: float = 5.0
+    JOB_POLL_SECONDS: float = 2.0
+    JOB_LEASE_SECONDS: float = 300.0
+    JOB_REAP_SECONDS: float = 60.0  # how often workers reclaim jobs whose lease expired
+    GEMINI_REQUESTS_PER_MINUTE: int = 15
+    GEMINI_BATCH_SIZE: int = 20  # animals packed into one fun-fact prompt
+
+    # GET /animals/search
+    SEARCH_FUZZY_THRESHOLD: float = 0.3  # pg_trgm word similarity, 0..1
+
+    # GET /animals/events (app.services.event_bus)
+    EVENTS_BUFFER_SIZE: int = 1000  # frames kept for Last-Event-ID resume
+    EVENTS_QUEUE_SIZE: int = 256  # per-client backlog before it is dropped
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    EVENTS_RETRY_SECONDS: float = 3.0  # client reconnect delay sent in "retry:"
+
+    # API Ninjas response cache (in-process LRU + external_api_cache table)
+    API_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    API_CACHE_NEGATIVE_TTL_SECONDS: int = 6 * 3600  # names that returned nothing
+    API_CACHE_MAX_ENTRIES: int = 5000
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,136 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+# ── HTTP ─────────────────────────────────────────────────────────────────────
+REQUEST_LATENCY = Histogram(
+    "evograph_http_request_duration_seconds",
+    "Request latency by route template.",
+    ["method", "route", "status"],
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "evograph_db_queries_per_request",
+    "SQL statements executed while serving one request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+
+# ── CREATE PIPELINE ──────────────────────────────────────────────────────────
+CREATE_STAGE_LATENCY = Histogram(
+    "evograph_create_stage_duration_seconds",
+    "Time spent in each stage of POST /animals/.",
+    ["stage"],
+)
+
+# ── OUTBOUND CALLS ───────────────────────────────────────────────────────────
+OUTBOUND_LATENCY = Histogram(
+    "evograph_outbound_request_duration_seconds",
+    "Latency of calls to external providers, per attempt.",
+    ["provider", "status"],
+)
+
+# ── DATABASE POOL ────────────────────────────────────────────────────────────
+DB_POOL_CONNECTIONS = Gauge(
+    "evograph_db_pool_connections",
+    "SQLAlchemy pool connections by state.",
+    ["engine", "state"],
+)
+
+# ── JOB QUEUE ────────────────────────────────────────────────────────────────
+JOB_QUEUE_DEPTH = Gauge(
+    "evograph_job_queue_jobs",
+    "Enrichment jobs by kind and status.",
+    ["kind", "status"],
+)
+
+JOBS_PROCESSED = Counter(
+    "evograph_jobs_processed_total",
+    "Enrichment jobs finished by a worker, by outcome.",
+    ["kind", "outcome"],
+)
+
+# ── CACHES ───────────────────────────────────────────────────────────────────
+class CacheLookupCollector:
+    """
+    Exposes each cache's own cumulative hit/miss counts as the counter
+    `evograph_cache_lookups_total`, read at scrape time, so `rate()` works
+    without the caches knowing about Prometheus.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[str, Callable[[], dict]] = {}
+
+    def add_source(self, cache: str, stats: Callable[[], dict]) -> None:
+        self._sources[cache] = stats
+
+    def collect(self) -> Iterator[CounterMetricFamily]:
+        family = CounterMetricFamily(
+            "evograph_cache_lookups", "Cache lookups by cache and result.", labels=["cache", "result"],
+        )
+        for cache, stats in self._sources.items():
+            counts = stats()
+            for result in ("hits", "misses"):
+                family.add_metric([cache, result], counts.get(result, 0))
+        yield family
+
+
+CACHE_LOOKUPS = CacheLookupCollector()
+REGISTRY.register(CACHE_LOOKUPS)
+
+
+# ── HELPERS ──────────────────────────────────────────────────────────────────
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        CREATE_STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def outbound_timer(provider: str) -> Iterator[dict[str, str]]:
+    """Yields a dict; set its "status" to the HTTP status (defaults to "error")."""
+    outcome = {"status": "error"}
+    start = time.perf_counter()
+    try:
+        yield outcome
+    finally:
+        OUTBOUND_LATENCY.labels(provider, outcome["status"]).observe(time.perf_counter() - start)
+
+
+# Mutable counter for the current request; None outside requests (workers, CLI).
+_query_counter: ContextVar[Optional[list[int]]] = ContextVar("query_counter", default=None)
+
+
+def start_query_count() -> list[int]:
+    counter = [0]
+    _query_counter.set(counter)
+    return counter
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_query(*_args) -> None:
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+def record_pool(engine: AsyncEngine, name: str = "primary") -> None:
+    pool = engine.pool
+    for state, value in (
+        ("size", pool.size()),
+        ("checked_out", pool.checkedout()),
+        ("checked_in", pool.checkedin()),
+        ("overflow", pool.overflow()),
+    ):
+        DB_POOL_CONNECTIONS.labels(name, state).set(value)
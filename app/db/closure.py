@@ -0,0 +1,129 @@
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+
+# ── QUERIES ──────────────────────────────────────────────────────────────────
+LINEAGE_QUERY = text("""
+    SELECT a.id, a.name, a.ancestor_id, c.depth
+    FROM animal_closure c
+    JOIN animals a ON a.id = c.ancestor_id
+    WHERE c.descendant_id = :start_id
+    ORDER BY c.depth ASC;
+""")
+
+# Rows come parent-before-child (by depth), which nested builders rely on.
+SUBTREE_QUERY = text("""
+    SELECT a.id, a.name, a.ancestor_id, c.depth
+    FROM animal_closure c
+    JOIN animals a ON a.id = c.descendant_id
+    WHERE c.ancestor_id = :root_id AND c.depth <= :max_depth
+    ORDER BY c.depth ASC, a.id ASC;
+""")
+
+BACKFILL_QUERY = text("""
+    WITH RECURSIVE paths AS (
+        SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth
+        FROM animals
+        UNION ALL
+        SELECT a.ancestor_id, p.descendant_id, p.depth + 1
+        FROM paths p
+        INNER JOIN animals a ON a.id = p.ancestor_id
+        WHERE a.ancestor_id IS NOT NULL
+    )
+    INSERT INTO animal_closure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, depth FROM paths;
+""")
+
+_LINK_NODE = text("""
+    INSERT INTO animal_closure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, CAST(:node_id AS INTEGER), depth + 1
+    FROM animal_closure WHERE descendant_id = :parent_id
+    UNION ALL
+    SELECT CAST(:node_id AS INTEGER), CAST(:node_id AS INTEGER), 0;
+""")
+
+_LINK_NODES = text("""
+    INSERT INTO animal_closure (ancestor_id, descendant_id, depth)
+    SELECT c.ancestor_id, n.id, c.depth + 1
+    FROM unnest(CAST(:node_ids AS INTEGER[]), CAST(:parent_ids AS INTEGER[])) AS n(id, parent_id)
+    JOIN animal_closure c ON c.descendant_id = n.parent_id
+    UNION ALL
+    SELECT id, id, 0 FROM unnest(CAST(:node_ids AS INTEGER[])) AS n(id);
+""")
+
+# Drops every path that runs *through* the node, i.e. links between its
+# proper ancestors and its subtree. The node's own rows go with the FK cascade.
+_DETACH_SUBTREE = text("""
+    DELETE FROM animal_closure
+    WHERE descendant_id IN (
+        SELECT descendant_id FROM animal_closure WHERE ancestor_id = :node_id
+    )
+    AND ancestor_id IN (
+        SELECT ancestor_id FROM animal_closure
+        WHERE descendant_id = :node_id AND ancestor_id <> :node_id
+    );
+""")
+
+# Removes the node and everything below it; closure rows and enrichment
+# jobs go with them through their ON DELETE CASCADE foreign keys.
+_DELETE_SUBTREE = text("""
+    DELETE FROM animals
+    WHERE id IN (SELECT descendant_id FROM animal_closure WHERE ancestor_id = :node_id)
+    RETURNING id;
+""")
+
+# Before a node is spliced out: its descendants move one level closer to
+# every ancestor above it. Its own rows disappear with the node.
+_CONTRACT_NODE = text("""
+    UPDATE animal_closure SET depth = depth - 1
+    WHERE descendant_id IN (
+        SELECT descendant_id FROM animal_closure WHERE ancestor_id = :node_id AND depth > 0
+    )
+    AND ancestor_id IN (
+        SELECT ancestor_id FROM animal_closure WHERE descendant_id = :node_id AND depth > 0
+    );
+""")
+
+
+# ── MAINTENANCE ──────────────────────────────────────────────────────────────
+async def link_node(db: AsyncSession, node_id: int, parent_id: Optional[int]) -> None:
+    """Adds the closure rows for a freshly inserted node (parent rows must exist)."""
+    await db.execute(_LINK_NODE, {"node_id": node_id, "parent_id": parent_id})
+
+
+async def link_nodes(db: AsyncSession, pairs: list[tuple[int, Optional[int]]]) -> None:
+    """Set-based `link_node` for (node_id, parent_id) pairs whose parents are already linked."""
+    if not pairs:
+        return
+    await db.execute(_LINK_NODES, {
+        "node_ids": [node_id for node_id, _ in pairs],
+        "parent_ids": [parent_id for _, parent_id in pairs],
+    })
+
+
+async def detach_subtree(db: AsyncSession, node_id: int) -> None:
+    """Call before deleting a node whose children get `ancestor_id = NULL`."""
+    await db.execute(_DETACH_SUBTREE, {"node_id": node_id})
+
+
+async def delete_subtree(db: AsyncSession, node_id: int) -> list[int]:
+    """Deletes the node and all of its descendants; returns the deleted ids."""
+    result = await db.execute(_DELETE_SUBTREE, {"node_id": node_id})
+    return list(result.scalars())
+
+
+async def contract_node(db: AsyncSession, node_id: int) -> None:
+    """Call before deleting a node whose children move up to its parent."""
+    await db.execute(_CONTRACT_NODE, {"node_id": node_id})
+
+
+async def backfill_if_empty(conn: AsyncConnection) -> None:
+    """Populates the closure table for databases created before it existed."""
+    needs_backfill = await conn.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM animals) "
+        "AND NOT EXISTS (SELECT 1 FROM animal_closure)"
+    ))
+    if needs_backfill:
+        await conn.execute(BACKFILL_QUERY)
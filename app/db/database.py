@@ -1,10 +1,30 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
 
-engine = create_async_engine(settings.DATABASE_URL)
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # SQLAlchemy's own cache and asyncpg's; both must be 0 behind a
+            # transaction-pooling PgBouncer.
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
+
+# Without a replica, reads share the primary engine and its pool.
+replica_engine = _create_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else engine
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -13,6 +33,13 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    bind=replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 class Base(DeclarativeBase):
     pass
 
@@ -21,3 +48,9 @@ class Base(DeclarativeBase):
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db() -> AsyncSession:
+    """Session for read-only routes; served by the replica when one is configured."""
+    async with ReadSessionLocal() as session:
+        yield session
@@ -0,0 +1,72 @@
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.closure import link_nodes
+from app.db.models import Animal
+
+
+_INSERT_CHUNK = 1000  # rows per multi-row INSERT statement
+
+
+def chunks(items: list[Any], size: int) -> Iterable[list[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def lookup_names(db: AsyncSession, names: list[str]) -> dict[str, int]:
+    """name → id for whichever of `names` exist, in one `name = ANY(...)` query."""
+    if not names:
+        return {}
+    result = await db.execute(select(Animal.name, Animal.id).where(Animal.name.in_(names)))
+    return dict(result.tuples().all())
+
+
+async def insert_nodes(db: AsyncSession, rows: list[dict[str, Any]]) -> tuple[dict[str, int], set[str]]:
+    """
+    Multi-row `INSERT ... ON CONFLICT (name) DO NOTHING RETURNING`. Names a
+    concurrent writer inserted first are looked up afterwards instead of
+    failing on the unique index. Returns (name → id for every row, names
+    this call actually inserted).
+    """
+    ids: dict[str, int] = {}
+    for chunk in chunks(rows, _INSERT_CHUNK):
+        stmt = (
+            pg_insert(Animal)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=[Animal.name])
+            .returning(Animal.id, Animal.name)
+        )
+        ids.update({name: node_id for node_id, name in (await db.execute(stmt)).tuples()})
+    inserted = set(ids)
+    ids.update(await lookup_names(db, [row["name"] for row in rows if row["name"] not in ids]))
+    return ids, inserted
+
+
+async def resolve_hierarchy(
+    db: AsyncSession,
+    hierarchy: list[str],
+    known: dict[str, int],
+) -> tuple[Optional[int], dict[str, int], list[tuple[int, Optional[int]]]]:
+    """
+    Makes sure every taxon in `hierarchy` (root first) exists, inserting the
+    missing ones under the previous level. `known` is the result of an
+    earlier `lookup_names`, so a chain that already exists costs no queries.
+
+    Returns (id of the last level, name → id for the chain, newly inserted
+    (id, parent_id) pairs, already linked into the closure table).
+    """
+    ids = {name: known[name] for name in hierarchy if name in known}
+    new_nodes: list[tuple[int, Optional[int]]] = []
+    parent_id: Optional[int] = None
+    for taxon_name in hierarchy:
+        if taxon_name not in ids:
+            row_ids, inserted = await insert_nodes(db, [{"name": taxon_name, "ancestor_id": parent_id}])
+            ids[taxon_name] = row_ids[taxon_name]
+            if inserted:
+                new_nodes.append((ids[taxon_name], parent_id))
+                await link_nodes(db, [(ids[taxon_name], parent_id)])
+        parent_id = ids[taxon_name]
+    return parent_id, ids, new_nodes
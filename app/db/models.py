@@ -1,6 +1,7 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -9,6 +10,14 @@ from app.db.database import Base
 class Animal(Base):
    
     __tablename__ = "animals"
+    # Trigram indexes for GET /animals/search; need the pg_trgm extension.
+    __table_args__ = (
+        Index("ix_animals_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_animals_scientific_name_trgm", "scientific_name",
+            postgresql_using="gin", postgresql_ops={"scientific_name": "gin_trgm_ops"},
+        ),
+    )
 
    
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -50,3 +59,71 @@ class Animal(Base):
 
     def __repr__(self) -> str:
         return f"<Animal id={self.id} name='{self.name}' ancestor_id={self.ancestor_id}>"
+
+
+class AnimalClosure(Base):
+    """
+    Materialized ancestry: one row per (ancestor, descendant) pair,
+    including the zero-depth self pair. Kept in sync by app.db.closure.
+    """
+    __tablename__ = "animal_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("animals.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("animals.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<AnimalClosure {self.ancestor_id} → {self.descendant_id} depth={self.depth}>"
+
+
+class ExternalApiCache(Base):
+    """Durable layer of the outbound API cache; an empty payload is a cached miss."""
+    __tablename__ = "external_api_cache"
+
+    provider:   Mapped[str]      = mapped_column(String(50),  primary_key=True)
+    key:        Mapped[str]      = mapped_column(String(200), primary_key=True)
+    payload:    Mapped[Any]      = mapped_column(JSON, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ExternalApiCache {self.provider}:{self.key} expires_at={self.expires_at}>"
+
+
+class EnrichmentJob(Base):
+    """A deferred enrichment step (image lookup, fun fact) for one animal."""
+    __tablename__ = "enrichment_jobs"
+    __table_args__ = (Index("ix_enrichment_jobs_status_run_after", "status", "run_after"),)
+
+    id:        Mapped[int] = mapped_column(Integer, primary_key=True)
+    animal_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("animals.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    kind:       Mapped[str]           = mapped_column(String(30), nullable=False)
+    status:     Mapped[str]           = mapped_column(String(20), nullable=False, default="pending")
+    attempts:   Mapped[int]           = mapped_column(Integer,    nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text,       nullable=True)
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<EnrichmentJob id={self.id} kind='{self.kind}' animal_id={self.animal_id} status='{self.status}'>"
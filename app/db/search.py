@@ -0,0 +1,18 @@
+from sqlalchemy import text
+
+# Typo-tolerant match on whole words of name / scientific_name. `<%` is
+# pg_trgm's word-similarity operator and is served by the GIN trigram
+# indexes; its cut-off comes from pg_trgm.word_similarity_threshold.
+FUZZY_SEARCH_QUERY = text("""
+    SELECT id, name, scientific_name,
+           greatest(word_similarity(:q, name), word_similarity(:q, coalesce(scientific_name, ''))) AS score
+    FROM animals
+    WHERE :q <% name OR :q <% scientific_name
+    ORDER BY score DESC, length(name) ASC, id ASC
+    LIMIT :limit;
+""")
+
+# Transaction-local, so pooled connections keep the server default.
+SET_SIMILARITY_THRESHOLD = text(
+    "SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"
+)
@@ -1,22 +1,56 @@
 from contextlib import asynccontextmanager
 import os
+import time
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import text
 
+from app.api.jobs import router as jobs_router
 from app.api.routes import router
-from app.db.database import Base, engine
+from app.core.metrics import (
+    CACHE_LOOKUPS,
+    DB_QUERIES_PER_REQUEST,
+    JOB_QUEUE_DEPTH,
+    REQUEST_LATENCY,
+    instrument_engine,
+    record_pool,
+    start_query_count,
+)
+from app.db.closure import backfill_if_empty
+from app.db.database import AsyncSessionLocal, Base, engine, replica_engine
+from app.services.enrichment import register_handlers
+from app.services.external_api import cache_stats as api_ninjas_cache_stats
+from app.services.http_clients import http_clients
+from app.services.job_queue import job_queue
+from app.services.name_index import name_index
+from app.services.response_cache import response_cache
+from app.services.taxonomy_index import taxonomy_index
 
 
 # LIFESPAN:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        await backfill_if_empty(conn)
+    async with AsyncSessionLocal() as session:
+        await taxonomy_index.rebuild(session)
+        await name_index.rebuild(session)
+    await http_clients.open()
+    register_handlers(job_queue)
+    await job_queue.start()
     yield
-   
+    await job_queue.stop()
+    await http_clients.close()
+    await engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
+
 
 
 app = FastAPI(
@@ -24,6 +58,7 @@ app = FastAPI(
     description="REST API for managing the evolutionary tree of life.",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -34,7 +69,31 @@ app.add_middleware(
 )
 
 
+instrument_engine(engine)
+if replica_engine is not engine:
+    instrument_engine(replica_engine)
+CACHE_LOOKUPS.add_source("api_ninjas", api_ninjas_cache_stats)
+CACHE_LOOKUPS.add_source("responses", response_cache.stats)
+
+
+# METRICS MIDDLEWARE:
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    start = time.perf_counter()
+    queries = start_query_count()
+    response = await call_next(request)
+    # Label by route template so /animals/{animal_id} stays one series.
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    REQUEST_LATENCY.labels(request.method, path, str(response.status_code)).observe(
+        time.perf_counter() - start
+    )
+    DB_QUERIES_PER_REQUEST.labels(path).observe(queries[0])
+    return response
+
+
 app.include_router(router)
+app.include_router(jobs_router)
 
 
 _STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
@@ -49,3 +108,23 @@ async def serve_frontend():
 @app.get("/health", tags=["System"])
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/cache/stats", tags=["System"])
+async def get_cache_stats():
+    return {"api_ninjas": api_ninjas_cache_stats(), "responses": response_cache.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Point-in-time gauges are refreshed on scrape rather than on every change.
+    record_pool(engine)
+    if replica_engine is not engine:
+        record_pool(replica_engine, "replica")
+    job_counts = await job_queue.stats()
+    # Groups with no rows left are absent from the query; drop their old values.
+    JOB_QUEUE_DEPTH.clear()
+    for kind, counts in job_counts.items():
+        for job_status, n in counts.items():
+            JOB_QUEUE_DEPTH.labels(kind, job_status).set(n)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ── INPUT SCHEMA ─────────────────────────────────────────────────────────────
@@ -49,6 +49,26 @@ class LineageResponse(BaseModel):
     lineage: List[AnimalLineageItem]  
 
 
+class AnimalSearchHit(BaseModel):
+    id: int
+    name: str
+    scientific_name: Optional[str] = None
+    match: Literal["prefix", "fuzzy"]
+    score: float                   # 1.0 for prefix hits, trigram similarity otherwise
+
+
+class AnimalSearchResponse(BaseModel):
+    query: str
+    results: List[AnimalSearchHit]
+
+
+class SubtreeNode(BaseModel):
+    id: int
+    name: str
+    depth: int                     # generations below the requested root
+    children: List["SubtreeNode"] = []
+
+
 # ── LCA SCHEMA ───────────────────────────────────────────────────────────────
 
 class LCAResponse(BaseModel):
@@ -56,3 +76,84 @@ class LCAResponse(BaseModel):
     animal1_distance: int         
     animal2_distance: int         
     total_distance: int          
+
+
+class RelativeItem(BaseModel):
+    id: int
+    name: str
+    scientific_name: Optional[str] = None
+    common_ancestor_id: int
+    common_ancestor_name: str
+    animal_distance: int           # steps from the queried animal up to the common ancestor
+    relative_distance: int         # steps from this relative up to the common ancestor
+    total_distance: int
+
+
+class RelativesResponse(BaseModel):
+    animal_id: int
+    relatives: List[RelativeItem]  # closest first; ties → deeper common ancestor first
+
+
+# ── BULK IMPORT SCHEMA ───────────────────────────────────────────────────────
+
+class BulkImportRequest(BaseModel):
+    names: List[str] = Field(min_length=1, max_length=10000)
+
+
+class BulkImportItem(BaseModel):
+    name: str
+    status: str                      # created | exists | not_found | duplicate | error
+    animal_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkImportReport(BaseModel):
+    total: int
+    created: int
+    failed: int                      # everything that is not created
+    items: List[BulkImportItem]
+
+
+class TreeImportResponse(BaseModel):
+    imported: int
+
+
+# ── GRAPH SCHEMA ─────────────────────────────────────────────────────────────
+
+class GraphResponse(BaseModel):
+    """Parallel arrays: index i of every list describes the same node."""
+    version: int
+    ids: List[int]
+    names: List[str]
+    ancestor_ids: List[Optional[int]]
+    is_leaf: List[bool]  # registered species (has a scientific name)
+
+
+class GraphLayoutResponse(BaseModel):
+    """Fixed coordinates for every node of /animals/graph, as parallel arrays."""
+    version: int
+    mode: Literal["tree", "radial"]
+    ids: List[int]
+    x: List[float]
+    y: List[float]
+
+
+class LCABatchRequest(BaseModel):
+    ids: List[int] = Field(min_length=2, max_length=2000)
+
+
+class LCAPairItem(BaseModel):
+    animal1_id: int
+    animal2_id: int
+    common_ancestor_id: Optional[int] = None
+    total_distance: Optional[int] = None
+
+
+class LCABatchPairsResponse(BaseModel):
+    pairs: List[LCAPairItem]
+
+
+class LCABatchMatrixResponse(BaseModel):
+    ids: List[int]
+    common_ancestor_ids: List[List[int]]  # -1 → no common ancestor
+    distances: List[List[int]]            # -1 → no common ancestor
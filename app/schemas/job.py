@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class EnrichmentJobRead(BaseModel):
+    id: int
+    animal_id: int
+    kind: str
+    status: str        # pending | running | done | failed
+    attempts: int
+    last_error: Optional[str] = None
+    run_after: datetime
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class QueueStats(BaseModel):
+    depth: int                          # pending + running jobs
+    by_kind: Dict[str, Dict[str, int]]  # kind → status → count
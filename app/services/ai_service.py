@@ -1,11 +1,17 @@
+import json
 import logging
 from typing import Optional
 
 from google import genai
+from sqlalchemy import bindparam, update
 
 from app.core.config import settings
+from app.core.metrics import outbound_timer
 from app.db.database import AsyncSessionLocal
 from app.db.models import Animal
+from app.services.event_bus import event_bus
+from app.services.rate_limit import RateLimiter
+from app.services.response_cache import invalidate_animals
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +21,11 @@ _client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
 _MODEL = "gemini-2.5-flash-lite"
 
+_rate_limiter = RateLimiter(settings.GEMINI_REQUESTS_PER_MINUTE)
+
+# (animal_id, name, taxonomy_class)
+AnimalRef = tuple[int, str, Optional[str]]
+
 
 def _build_prompt(animal_name: str, taxonomy_class: Optional[str]) -> str:
     context = f" (Class: {taxonomy_class})" if taxonomy_class else ""
@@ -27,61 +38,112 @@ def _build_prompt(animal_name: str, taxonomy_class: Optional[str]) -> str:
     )
 
 
-async def generate_fun_fact(
-    animal_name: str,
-    animal_id: int,
-    taxonomy_class: Optional[str] = None,
-) -> None:
+def _build_batch_prompt(animals: list[AnimalRef]) -> str:
+    lines = "\n".join(
+        f"- id {animal_id}: {name}" + (f" (Class: {taxonomy_class})" if taxonomy_class else "")
+        for animal_id, name, taxonomy_class in animals
+    )
+    return (
+        f"You are a concise evolutionary biologist. For EACH animal below, write "
+        f"1-2 sentences highlighting its evolutionary origins, ancestors, or "
+        f"interesting relatives. Do NOT use greetings, salutations, or phrases like 'Dear'.\n"
+        f"Respond with only a JSON object mapping each id (as a string) to its text, "
+        f'e.g. {{"12": "..."}}.\n\n{lines}'
+    )
+
+
+# ── GENERATION ───────────────────────────────────────────────────────────────
+async def generate_fun_fact(animal_name: str, taxonomy_class: Optional[str] = None) -> str:
     """
     Generates an evolutionary fun fact using the Google Gemini API
-    (google-genai SDK) and writes it to the database.
+    (google-genai SDK). Errors propagate so the job queue can retry them.
     """
     logger.info(f"[Gemini] Starting fun_fact generation for '{animal_name}'...")
-
-    fun_fact_text: Optional[str] = None
-
-    # ── 1. GEMINI API CALL ────────────────────────────────────────────────────
-    try:
-        prompt = _build_prompt(animal_name, taxonomy_class)
-
+    await _rate_limiter.acquire()
+    with outbound_timer("gemini") as outcome:
         response = await _client.aio.models.generate_content(
             model=_MODEL,
-            contents=prompt,
-        )
-        fun_fact_text = response.text.strip()
-        logger.info(
-            f"[Gemini] Fun fact generated for '{animal_name}': {fun_fact_text[:80]}..."
+            contents=_build_prompt(animal_name, taxonomy_class),
         )
+        outcome["status"] = "ok"
+    fun_fact_text = response.text.strip()
+    logger.info(
+        f"[Gemini] Fun fact generated for '{animal_name}': {fun_fact_text[:80]}..."
+    )
+    return fun_fact_text
 
-    except Exception as gemini_err:
-    
-        logger.error(
-            f"[Gemini] API call failed for '{animal_name}': {gemini_err}",
-            exc_info=True,
-        )
-        return  
 
-    # ── 2. WRITE TO DATABASE ─────────────────────────────────────────────────
+async def _generate_batch(animals: list[AnimalRef]) -> dict[int, str]:
+    """One Gemini call for many animals; returns only the well-formed entries."""
+    await _rate_limiter.acquire()
+    with outbound_timer("gemini") as outcome:
+        response = await _client.aio.models.generate_content(
+            model=_MODEL,
+            contents=_build_batch_prompt(animals),
+            config={"response_mime_type": "application/json"},
+        )
+        outcome["status"] = "ok"
     try:
-        async with AsyncSessionLocal() as session:
-            animal = await session.get(Animal, animal_id)
-            if animal is None:
-                logger.warning(
-                    f"[Gemini] Animal id={animal_id} has been deleted, skipping save."
-                )
-                return
-
-            animal.fun_fact = fun_fact_text
-            await session.commit()
-            logger.info(
-                f"[Gemini] Fun fact for '{animal_name}' saved to DB."
-            )
-
-    except Exception as db_err:
-        logger.error(
-            f"[Gemini] Failed to write fun fact for '{animal_name}' to DB: {db_err}",
-            exc_info=True,
+        data = json.loads(response.text)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"[Gemini] Batch response was not valid JSON: {e}")
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    wanted = {animal_id for animal_id, _, _ in animals}
+    facts: dict[int, str] = {}
+    for key, value in data.items():
+        if str(key).isdigit() and int(key) in wanted and isinstance(value, str) and value.strip():
+            facts[int(key)] = value.strip()
+    return facts
+
+
+async def generate_fun_facts(
+    animals: list[AnimalRef],
+) -> tuple[dict[int, str], dict[int, Exception]]:
+    """
+    Fun facts for many animals, packed into a single prompt when there is
+    more than one. Animals missing or malformed in the batched answer fall
+    back to individual calls. Returns (facts, failures) keyed by animal id.
+    """
+    facts: dict[int, str] = {}
+    failures: dict[int, Exception] = {}
+
+    if len(animals) > 1:
+        try:
+            facts = await _generate_batch(animals)
+            logger.info(f"[Gemini] Batch of {len(animals)} returned {len(facts)} fun facts.")
+        except Exception as e:
+            logger.warning(f"[Gemini] Batch call for {len(animals)} animals failed: {e}")
+
+    for animal_id, name, taxonomy_class in animals:
+        if animal_id in facts:
+            continue
+        try:
+            facts[animal_id] = await generate_fun_fact(name, taxonomy_class)
+        except Exception as e:
+            logger.error(f"[Gemini] API call failed for '{name}': {e}", exc_info=True)
+            failures[animal_id] = e
+    return facts, failures
+
+
+# ── WRITE TO DATABASE ────────────────────────────────────────────────────────
+async def save_fun_facts(facts: dict[int, str]) -> None:
+    """Writes all facts in one transaction; ids deleted meanwhile are skipped."""
+    if not facts:
+        return
+    table = Animal.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(fun_fact=bindparam("b_fun_fact"))
+    )
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            stmt, [{"b_id": animal_id, "b_fun_fact": text} for animal_id, text in facts.items()]
         )
-
-
-
+        await session.commit()
+    invalidate_animals(facts)
+    event_bus.publish("fun_fact", animals=[{"id": animal_id, "fun_fact": text} for animal_id, text in facts.items()])
+    logger.info(f"[Gemini] {len(facts)} fun fact(s) saved to DB.")
@@ -0,0 +1,233 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.closure import link_nodes
+from app.db.database import AsyncSessionLocal
+from app.db.hierarchy import chunks, insert_nodes, lookup_names
+from app.db.models import Animal, EnrichmentJob
+from app.schemas.animal import BulkImportItem, BulkImportReport
+from app.services.external_api import fetch_animal_data
+from app.services.name_index import name_index
+from app.services.event_bus import event_bus
+from app.services.response_cache import invalidate_animals
+from app.services.taxonomy_index import taxonomy_index
+
+logger = logging.getLogger(__name__)
+
+
+_JOB_CHUNK = 1000  # enrichment job rows per INSERT
+
+_LEAF_FIELDS = ("scientific_name", "taxonomy_class", "locations", "temperament", "lifespan", "weight")
+
+
+# ── INPUT PARSING ────────────────────────────────────────────────────────────
+def parse_names(payload: str, fmt: str) -> list[str]:
+    """
+    Extracts animal names from a text payload.
+    csv   → the `name` column if there is a header with one, else the first column
+    jsonl → one JSON string or {"name": ...} object per line
+    txt   → one name per line
+    """
+    if fmt == "csv":
+        rows = [row for row in csv.reader(io.StringIO(payload)) if row and row[0].strip()]
+        header = [cell.strip().lower() for cell in rows[0]] if rows else []
+        if "name" in header:
+            column = header.index("name")
+            return [row[column] for row in rows[1:] if len(row) > column]
+        return [row[0] for row in rows]
+    if fmt == "jsonl":
+        names = []
+        for line in payload.splitlines():
+            if line.strip():
+                item = json.loads(line)
+                names.append(item["name"] if isinstance(item, dict) else str(item))
+        return names
+    if fmt == "txt":
+        return [line for line in payload.splitlines() if line.strip()]
+    raise ValueError(f"Unsupported format '{fmt}'.")
+
+
+# ── HELPERS ──────────────────────────────────────────────────────────────────
+async def _fetch_all(names: list[str], concurrency: int) -> dict[str, Any]:
+    """name → API Ninjas data ({} if unknown) or the exception raised."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(name: str) -> Any:
+        async with semaphore:
+            try:
+                return await fetch_animal_data(name)
+            except Exception as e:
+                return e
+
+    results = await asyncio.gather(*(fetch(name) for name in names))
+    return dict(zip(names, results))
+
+
+# ── IMPORT ───────────────────────────────────────────────────────────────────
+async def _import_chunk(
+    names: list[str],
+    concurrency: int,
+) -> tuple[list[BulkImportItem], list[tuple[int, Optional[int]]], list[tuple[int, str, Optional[str]]]]:
+    """
+    Imports one chunk in a single transaction; returns its report rows, the
+    new (id, parent) pairs and (id, name, scientific_name) of every new or
+    promoted row.
+    """
+    fetched = await _fetch_all(names, concurrency)
+
+    items: dict[str, BulkImportItem] = {}
+    species: dict[str, tuple[str, dict[str, Any]]] = {}  # leaf name → (input name, api data)
+    for name in names:
+        data = fetched[name]
+        if isinstance(data, Exception):
+            items[name] = BulkImportItem(name=name, status="error", detail=str(data))
+        elif not data:
+            items[name] = BulkImportItem(name=name, status="not_found", detail="No animal found on API Ninjas.")
+        else:
+            leaf_name = data.get("proper_name") or name
+            if leaf_name in species:
+                items[name] = BulkImportItem(name=name, status="duplicate", detail=f"Same species as '{species[leaf_name][0]}'.")
+            else:
+                species[leaf_name] = (name, data)
+
+    # Unique hierarchy nodes, each with the parent from the first chain that mentions it.
+    taxon_parent: dict[str, Optional[str]] = {}
+    for _, data in species.values():
+        parent = None
+        for taxon_name in data.get("taxonomy_hierarchy", []):
+            taxon_parent.setdefault(taxon_name, parent)
+            parent = taxon_name
+
+    new_nodes: list[tuple[int, Optional[int]]] = []
+    named: list[tuple[int, str, Optional[str]]] = []
+    async with AsyncSessionLocal() as db:
+        existing = await lookup_names(db, list(taxon_parent) + list(species))
+        ids = dict(existing)
+
+        # Missing taxa go in parent-first: one multi-row INSERT per wave.
+        pending = [n for n in taxon_parent if n not in ids]
+        while pending:
+            ready = [n for n in pending if taxon_parent[n] is None or taxon_parent[n] in ids]
+            if not ready:
+                raise RuntimeError(f"Cyclic taxonomy hierarchy among {pending[:5]}")
+            wave_ids, inserted = await insert_nodes(
+                db, [{"name": n, "ancestor_id": ids.get(taxon_parent[n])} for n in ready]
+            )
+            fresh = [(wave_ids[n], ids.get(taxon_parent[n])) for n in ready if n in inserted]
+            await link_nodes(db, fresh)
+            new_nodes += fresh
+            named += [(wave_ids[n], n, None) for n in ready if n in inserted]
+            ids.update(wave_ids)
+            pending = [n for n in pending if n not in ids]
+
+        # Species rows: insert new leaves, or fill in a taxon this chunk just created.
+        leaf_rows: list[dict[str, Any]] = []
+        promoted: dict[str, dict[str, Any]] = {}
+        for leaf_name, (name, data) in species.items():
+            if leaf_name in existing:
+                items[name] = BulkImportItem(
+                    name=name, status="exists", animal_id=existing[leaf_name],
+                    detail=f"'{leaf_name}' is already registered in the database.",
+                )
+                continue
+            fields = {field: data.get(field) for field in _LEAF_FIELDS}
+            if leaf_name in ids:
+                promoted[leaf_name] = {"id": ids[leaf_name], **fields}
+                continue
+            hierarchy = data.get("taxonomy_hierarchy", [])
+            leaf_rows.append({"name": leaf_name, "ancestor_id": ids[hierarchy[-1]] if hierarchy else None, **fields})
+
+        leaf_ids, inserted = await insert_nodes(db, leaf_rows) if leaf_rows else ({}, set())
+        fresh = [(leaf_ids[row["name"]], row["ancestor_id"]) for row in leaf_rows if row["name"] in inserted]
+        await link_nodes(db, fresh)
+        new_nodes += fresh
+        named += [
+            (leaf_ids[row["name"]], row["name"], row["scientific_name"])
+            for row in leaf_rows if row["name"] in inserted
+        ]
+        named += [(row["id"], leaf_name, row["scientific_name"]) for leaf_name, row in promoted.items()]
+        if promoted:
+            await db.execute(update(Animal), list(promoted.values()))
+
+        created: dict[str, int] = {n: leaf_ids[n] for n in inserted}
+        created.update({leaf_name: row["id"] for leaf_name, row in promoted.items()})
+        for leaf_name in leaf_ids.keys() - inserted:
+            name = species[leaf_name][0]
+            items[name] = BulkImportItem(
+                name=name, status="exists", animal_id=leaf_ids[leaf_name],
+                detail=f"'{leaf_name}' was registered concurrently.",
+            )
+
+        jobs = [
+            {"animal_id": animal_id, "kind": kind, "status": "pending", "attempts": 0}
+            for animal_id in created.values()
+            for kind in ("image", "fun_fact")
+        ]
+        for chunk in chunks(jobs, _JOB_CHUNK):
+            await db.execute(pg_insert(EnrichmentJob).values(chunk))
+        await db.commit()
+
+    for leaf_name, animal_id in created.items():
+        name = species[leaf_name][0]
+        items[name] = BulkImportItem(name=name, status="created", animal_id=animal_id)
+    return [items[name] for name in names if name in items], new_nodes, named
+
+
+async def import_animals(
+    raw_names: list[str],
+    concurrency: int = 8,
+    chunk_size: int = 500,
+) -> BulkImportReport:
+    """
+    Bulk counterpart of `POST /animals/`: taxonomy is fetched concurrently
+    (at most `concurrency` in flight), hierarchy nodes are de-duplicated in
+    memory and written with multi-row upserts, one transaction per chunk.
+    Enrichment jobs are queued for every created species.
+    """
+    items: list[BulkImportItem] = []
+    names: list[str] = []
+    seen: set[str] = set()
+    for raw in raw_names:
+        name = raw.strip().title()
+        if not name:
+            continue
+        if name in seen:
+            items.append(BulkImportItem(name=name, status="duplicate", detail="Repeated in the input."))
+            continue
+        seen.add(name)
+        names.append(name)
+
+    for n, chunk in enumerate(chunks(names, chunk_size), start=1):
+        try:
+            chunk_items, new_nodes, named = await _import_chunk(chunk, concurrency)
+        except Exception as e:
+            logger.error(f"[Bulk] Chunk {n} ({len(chunk)} names) failed: {e}", exc_info=True)
+            items += [BulkImportItem(name=name, status="error", detail=str(e)) for name in chunk]
+            continue
+        items += chunk_items
+        for node_id, parent_id in new_nodes:
+            taxonomy_index.add(node_id, parent_id)
+        for animal_id, name, scientific_name in named:
+            name_index.add(animal_id, name, scientific_name)
+        invalidate_animals(item.animal_id for item in chunk_items if item.status == "created")
+        if named:
+            event_bus.publish("added", nodes=[
+                {
+                    "id": animal_id,
+                    "name": name,
+                    "ancestor_id": taxonomy_index.parent(animal_id),
+                    "is_leaf": scientific_name is not None,
+                }
+                for animal_id, name, scientific_name in named
+            ])
+        logger.info(f"[Bulk] Chunk {n}: {sum(i.status == 'created' for i in chunk_items)}/{len(chunk)} created.")
+
+    created = sum(item.status == "created" for item in items)
+    return BulkImportReport(total=len(items), created=created, failed=len(items) - created, items=items)
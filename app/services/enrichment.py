@@ -0,0 +1,67 @@
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.models import Animal, EnrichmentJob
+from app.services.ai_service import generate_fun_facts, save_fun_facts
+from app.services.image_service import fetch_animal_image_url
+from app.services.event_bus import event_bus
+from app.services.job_queue import JobQueue
+from app.services.response_cache import invalidate_animals
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_job(db: AsyncSession, animal_id: int, kind: str) -> EnrichmentJob:
+    """Adds a pending job in the caller's transaction; it runs once that commits."""
+    job = EnrichmentJob(animal_id=animal_id, kind=kind, status="pending", attempts=0)
+    db.add(job)
+    await db.flush()
+    return job
+
+
+# ── HANDLERS ─────────────────────────────────────────────────────────────────
+async def resolve_image(animal_id: int) -> None:
+    """Resolves an Unsplash photo for the animal; raises so the queue can retry."""
+    # Short transactions on either side: no connection is held during the HTTP race.
+    async with AsyncSessionLocal() as session:
+        animal = await session.get(Animal, animal_id)
+    if animal is None:
+        logger.warning(f"[Enrichment] Animal id={animal_id} has been deleted, skipping image.")
+        return
+
+    image_url = await fetch_animal_image_url(animal.name)
+    if image_url is None:
+        return
+
+    async with AsyncSessionLocal() as session:
+        animal = await session.get(Animal, animal_id)
+        if animal is None:
+            return
+        animal.image_url = image_url
+        await session.commit()
+    invalidate_animals([animal_id])
+    event_bus.publish("image", id=animal_id, image_url=image_url)
+
+
+async def write_fun_facts(animal_ids: list[int]) -> dict[int, Exception]:
+    """Generates fun facts for a batch of animals and stores them in one transaction."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Animal.id, Animal.name, Animal.taxonomy_class).where(Animal.id.in_(animal_ids))
+        )
+        animals = [tuple(row) for row in result.all()]
+    if len(animals) < len(set(animal_ids)):
+        logger.warning(f"[Enrichment] {len(set(animal_ids)) - len(animals)} animal(s) deleted, skipping fun facts.")
+
+    facts, failures = await generate_fun_facts(animals)
+    await save_fun_facts(facts)
+    return failures
+
+
+def register_handlers(queue: JobQueue) -> None:
+    queue.register("image", resolve_image)
+    queue.register_batch("fun_fact", write_fun_facts, batch_size=settings.GEMINI_BATCH_SIZE)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Optional
+
+import orjson
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Event kinds, as sent in the SSE "event:" field:
+#   added     {"nodes": [{"id", "name", "ancestor_id", "is_leaf"}]}   new or promoted nodes
+#   deleted   {"ids": [...], "reparented": [[child_id, new_ancestor_id], ...]}
+#   fun_fact  {"animals": [{"id", "fun_fact"}]}
+#   image     {"id", "image_url"}
+#   reset     {}   the client must refetch the whole tree
+Frame = tuple[int, bytes]
+
+
+def _frame(epoch: bytes, version: int, kind: str, data: dict[str, Any]) -> bytes:
+    return b"id: %s-%d\nevent: %s\ndata: %s\n\n" % (
+        epoch, version, kind.encode(), orjson.dumps({"version": version, **data}),
+    )
+
+
+class _Subscriber:
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue[Optional[Frame]] = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, frame: Frame) -> bool:
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop the backlog and end the stream. The
+            # client reconnects with Last-Event-ID and replays from the buffer.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class EventBus:
+    """
+    In-process change feed behind GET /animals/events. Every event gets
+    the next version, sent as the id `<epoch>-<version>`; the epoch is
+    random per process, so ids from before a restart (or from another
+    worker) never match. The last `buffer_size` frames are kept so a client
+    reconnecting with Last-Event-ID gets exactly what it missed, or a
+    `reset` when the gap is too old or the epoch differs.
+
+    Frames are encoded once in `publish` and shared by every subscriber.
+    Events only reach clients of the process that made the change.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int) -> None:
+        self.epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self._buffer: deque[Frame] = deque(maxlen=buffer_size)
+        self._queue_size = queue_size
+        self._subscribers: set[_Subscriber] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, kind: str, **data: Any) -> int:
+        self.version += 1
+        frame = (self.version, _frame(self.epoch.encode(), self.version, kind, data))
+        self._buffer.append(frame)
+        for subscriber in list(self._subscribers):
+            if not subscriber.put(frame):
+                self._subscribers.discard(subscriber)
+                logger.warning(f"[Events] Dropped a subscriber that fell {self._queue_size} events behind.")
+        return self.version
+
+    def _missed(self, last_event_id: str) -> Optional[list[Frame]]:
+        """Buffered frames after `last_event_id`, or None when they are no longer all buffered."""
+        epoch, _, version = last_event_id.partition("-")
+        if epoch != self.epoch or not version.isdigit():
+            return None
+        last_id = int(version)
+        if last_id > self.version:
+            return None
+        oldest = self._buffer[0][0] if self._buffer else self.version + 1
+        if last_id < oldest - 1:
+            return None
+        return [frame for frame in self._buffer if frame[0] > last_id]
+
+    async def stream(self, last_event_id: Optional[str], heartbeat: float) -> AsyncIterator[bytes]:
+        """SSE bytes for one client: replay, then live frames, with comment heartbeats."""
+        subscriber = _Subscriber(self._queue_size)
+        self._subscribers.add(subscriber)
+        # Replay is computed before the first yield; anything published after
+        # that arrives through the queue and is de-duplicated by version.
+        if last_event_id is None:
+            replay, sent = [], self.version
+        else:
+            missed = self._missed(last_event_id)
+            if missed is None:
+                reset = _frame(self.epoch.encode(), self.version, "reset", {})
+                replay, sent = [(self.version, reset)], self.version
+            else:
+                replay, sent = missed, self.version
+        try:
+            yield b"retry: %d\n\n" % int(settings.EVENTS_RETRY_SECONDS * 1000)
+            for _, body in replay:
+                yield body
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if frame is None:
+                    return
+                version, body = frame
+                if version > sent:
+                    sent = version
+                    yield body
+        finally:
+            self._subscribers.discard(subscriber)
+
+
+event_bus = EventBus(
+    buffer_size=settings.EVENTS_BUFFER_SIZE,
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+)
@@ -1,28 +1,120 @@
-from typing import Any
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
 
-import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.db.models import ExternalApiCache
+from app.services.cache import TTLCache
+from app.services.http_clients import http_clients
+from app.services.singleflight import SingleFlight
+from app.utils import normalize_name
+
+logger = logging.getLogger(__name__)
 
 
 _API_NINJAS_BASE = "https://api.api-ninjas.com/v1/animals"
 
 _TAXONOMY_LEVELS = ["kingdom", "phylum", "class", "order", "family", "genus"]
 
+_PROVIDER = "api_ninjas"
+
+_cache = TTLCache(max_entries=settings.API_CACHE_MAX_ENTRIES, ttl=settings.API_CACHE_TTL_SECONDS)
+_durable_hits = 0
+_flight = SingleFlight()
+
+
+def cache_stats() -> dict[str, Any]:
+    stats = _cache.stats()
+    stats["durable_hits"] = _durable_hits
+    stats["coalesced"] = _flight.coalesced
+    return stats
+
+
+# ── DURABLE CACHE (external_api_cache table) ─────────────────────────────────
+async def _load_cached(key: str) -> Optional[tuple[dict[str, Any], float]]:
+    try:
+        async with AsyncSessionLocal() as session:
+            row = await session.scalar(
+                select(ExternalApiCache).where(
+                    ExternalApiCache.provider == _PROVIDER,
+                    ExternalApiCache.key == key,
+                    ExternalApiCache.expires_at > datetime.now(timezone.utc),
+                )
+            )
+    except Exception as e:
+        logger.warning(f"[API Ninjas] Cache read failed for '{key}': {e}")
+        return None
+    if row is None:
+        return None
+    remaining = (row.expires_at - datetime.now(timezone.utc)).total_seconds()
+    return row.payload, remaining
+
+
+async def _store_cached(key: str, payload: dict[str, Any], ttl: int) -> None:
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+    stmt = pg_insert(ExternalApiCache).values(
+        provider=_PROVIDER, key=key, payload=payload, expires_at=expires_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ExternalApiCache.provider, ExternalApiCache.key],
+        set_={"payload": stmt.excluded.payload, "expires_at": stmt.excluded.expires_at},
+    )
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"[API Ninjas] Cache write failed for '{key}': {e}")
 
+
+# ── LOOKUP ───────────────────────────────────────────────────────────────────
 async def fetch_animal_data(animal_name: str) -> dict[str, Any]:
-   
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(
-            _API_NINJAS_BASE,
-            params={"name": animal_name},
-            headers={"X-Api-Key": settings.API_NINJAS_KEY},
-        )
+    """
+    Taxonomy + characteristics for `animal_name`, or {} if API Ninjas has
+    nothing. Both outcomes are cached (misses with a shorter TTL); HTTP
+    errors are not, so a rate-limit or outage is retried next time.
+    Concurrent lookups of the same name share one upstream fetch.
+    """
+    key = normalize_name(animal_name)
+
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+    return await _flight.do(key, lambda: _fetch_uncached(animal_name, key))
+
+
+async def _fetch_uncached(animal_name: str, key: str) -> dict[str, Any]:
+    global _durable_hits
+    durable = await _load_cached(key)
+    if durable is not None:
+        payload, remaining = durable
+        _durable_hits += 1
+        _cache.set(key, payload, ttl=remaining)
+        return payload
+
+    response = await http_clients.get(
+        _PROVIDER,
+        _API_NINJAS_BASE,
+        params={"name": animal_name},
+        headers={"X-Api-Key": settings.API_NINJAS_KEY},
+    )
 
     if response.status_code != 200:
+        logger.warning(f"[API Ninjas] HTTP {response.status_code} → '{animal_name}'")
         return {}
 
-    data = response.json()
+    result = _parse_animal(response.json())
+    ttl = settings.API_CACHE_TTL_SECONDS if result else settings.API_CACHE_NEGATIVE_TTL_SECONDS
+    _cache.set(key, result, ttl=ttl)
+    await _store_cached(key, result, ttl)
+    return result
+
+
+def _parse_animal(data: list[dict[str, Any]]) -> dict[str, Any]:
     if not data:
         return {}
 
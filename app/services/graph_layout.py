@@ -0,0 +1,139 @@
+import logging
+from typing import Literal, Optional
+
+import numpy as np
+
+from app.services.taxonomy_index import TaxonomyIndex, taxonomy_index
+
+logger = logging.getLogger(__name__)
+
+
+LayoutMode = Literal["tree", "radial"]
+
+# Matches the spacing the frontend used for vis.js' hierarchical layout.
+NODE_SPACING = 180.0
+LEVEL_SEPARATION = 150.0
+
+
+class GraphLayout:
+    """
+    Leaf-slot tree layout over the taxonomy index. Every leaf owns one
+    horizontal slot, in (parent, id) order; a node spans the slots of the
+    leaves below it and is centred over them. Depth gives the row (tree)
+    or ring (radial).
+
+    Slots are computed level by level with NumPy, so a full pass is
+    O(depth) vectorized steps. Appending a leaf only shifts the slots to
+    its right; anything else marks the layout stale until the next read.
+    """
+
+    def __init__(self, index: TaxonomyIndex) -> None:
+        self._index = index
+        self.version: Optional[int] = None  # index version the slots reflect
+        self._position: dict[int, int] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._parent = np.empty(0, dtype=np.int64)
+        self._depth = np.empty(0, dtype=np.int64)
+        self._start = np.empty(0, dtype=np.int64)  # first leaf slot of each node
+        self._width = np.empty(0, dtype=np.int64)  # leaf slots spanned by each node
+        self._responses: dict[LayoutMode, tuple[int, dict]] = {}
+        index.add_listener(self._on_index_change)
+
+    # ── FULL LAYOUT ───────────────────────────────────────────────────────────
+    def _compute(self) -> None:
+        ids, parent, depth = self._index.forest_arrays()
+        n = len(ids)
+        width = np.zeros(n, dtype=np.int64)
+        start = np.zeros(n, dtype=np.int64)
+        levels = [np.flatnonzero(depth == d) for d in range(int(depth.max(initial=-1)) + 1)]
+
+        # Bottom-up: a node is as wide as its children combined, leaves are 1.
+        for d in range(len(levels) - 1, -1, -1):
+            nodes = levels[d]
+            width[nodes] = np.maximum(width[nodes], 1)
+            if d > 0:
+                np.add.at(width, parent[nodes], width[nodes])
+
+        # Top-down: siblings sorted by id take consecutive runs of their parent's slots.
+        for d, nodes in enumerate(levels):
+            groups = parent[nodes] if d > 0 else np.zeros(len(nodes), dtype=np.int64)
+            sort = np.lexsort((ids[nodes], groups))
+            order, groups = nodes[sort], groups[sort]
+            offset = np.cumsum(width[order]) - width[order]
+            first = np.r_[True, groups[1:] != groups[:-1]] if len(order) else np.empty(0, dtype=bool)
+            group_base = offset[np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))]
+            start[order] = (start[parent[order]] if d > 0 else 0) + offset - group_base
+
+        self._position = {int(node_id): i for i, node_id in enumerate(ids)}
+        self._ids, self._parent, self._depth = ids.copy(), parent.copy(), depth.copy()
+        self._start, self._width = start, width
+        self.version = self._index.version
+        logger.info(f"[Layout] Laid out {n} nodes across {int(width[depth == 0].sum())} leaf slots.")
+
+    # ── INCREMENTAL UPDATES ───────────────────────────────────────────────────
+    def _on_index_change(self, kind: str, version: int, node_id: Optional[int], parent_id: Optional[int]) -> None:
+        if self.version != version - 1:
+            return  # already stale; the next read recomputes
+        if kind == "touch":
+            self.version = version
+        elif kind == "add" and node_id is not None:
+            self._append_leaf(node_id, parent_id)
+            self.version = version
+
+    def _append_leaf(self, node_id: int, parent_id: Optional[int]) -> None:
+        n = len(self._ids)
+        if parent_id is None:
+            slot, depth, parent_pos = int(self._width[self._depth == 0].sum()), 0, n
+        else:
+            parent_pos = self._position[parent_id]
+            depth = int(self._depth[parent_pos]) + 1
+            has_children = bool(np.any((self._parent == parent_pos) & (self._depth == depth)))
+            if has_children:
+                # New ids sort last among siblings: take the slot after the parent's span.
+                slot = int(self._start[parent_pos] + self._width[parent_pos])
+                self._start[self._start >= slot] += 1
+                ancestors = [parent_pos]
+                while self._depth[ancestors[-1]] > 0:
+                    ancestors.append(int(self._parent[ancestors[-1]]))
+                self._width[ancestors] += 1
+            else:
+                # A former leaf hands its slot to its first child; nothing moves.
+                slot = int(self._start[parent_pos])
+
+        self._position[node_id] = n
+        self._ids = np.append(self._ids, node_id)
+        self._parent = np.append(self._parent, parent_pos)
+        self._depth = np.append(self._depth, depth)
+        self._start = np.append(self._start, slot)
+        self._width = np.append(self._width, 1)
+
+    # ── COORDINATES ───────────────────────────────────────────────────────────
+    def coordinates(self, mode: LayoutMode = "tree") -> dict:
+        """`{version, mode, ids, x, y}` as parallel lists, cached per index version."""
+        if self.version != self._index.version:
+            self._compute()
+        cached = self._responses.get(mode)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        centre = self._start + (self._width - 1) / 2.0
+        if mode == "radial":
+            slots = max(int(self._width[self._depth == 0].sum()), 1)
+            angle = 2 * np.pi * (centre + 0.5) / slots
+            radius = self._depth * LEVEL_SEPARATION
+            x, y = radius * np.cos(angle), radius * np.sin(angle)
+        else:
+            x, y = centre * NODE_SPACING, self._depth * LEVEL_SEPARATION
+
+        payload = {
+            "version": self.version,
+            "mode": mode,
+            "ids": self._ids.tolist(),
+            "x": np.round(x, 1).tolist(),
+            "y": np.round(y, 1).astype(float).tolist(),
+        }
+        self._responses[mode] = (self.version, payload)
+        return payload
+
+
+graph_layout = GraphLayout(taxonomy_index)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import outbound_timer
+
+logger = logging.getLogger(__name__)
+
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    timeout: float
+    max_connections: int
+    concurrency: int
+    retries: int
+    backoff: float  # first retry delay in seconds, doubled each attempt
+
+
+_SERVICES: dict[str, ServiceConfig] = {
+    "api_ninjas": ServiceConfig(
+        timeout=settings.HTTP_TIMEOUT_SECONDS,
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        concurrency=settings.API_NINJAS_CONCURRENCY,
+        retries=settings.HTTP_RETRIES,
+        backoff=settings.HTTP_BACKOFF_SECONDS,
+    ),
+    "unsplash": ServiceConfig(
+        timeout=settings.HTTP_TIMEOUT_SECONDS,
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        concurrency=settings.UNSPLASH_CONCURRENCY,
+        retries=settings.HTTP_RETRIES,
+        backoff=settings.HTTP_BACKOFF_SECONDS,
+    ),
+}
+
+
+class HttpClientRegistry:
+    """
+    One keep-alive `httpx.AsyncClient` per outbound service, opened and
+    closed by the app lifespan. Clients are created lazily if a caller
+    (CLI, script) runs outside the lifespan.
+
+    Tests can route every service through a fake:
+        await http_clients.open(transport=httpx.MockTransport(handler))
+    """
+
+    def __init__(self, services: dict[str, ServiceConfig]) -> None:
+        self._services = services
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._transport: Optional[httpx.AsyncBaseTransport] = None
+
+    async def open(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        await self.close()
+        self._transport = transport
+        for service in self._services:
+            self.client(service)
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def client(self, service: str) -> httpx.AsyncClient:
+        client = self._clients.get(service)
+        if client is None:
+            config = self._services[service]
+            client = httpx.AsyncClient(
+                timeout=config.timeout,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_connections,
+                ),
+                transport=self._transport,
+            )
+            self._clients[service] = client
+            self._semaphores.setdefault(service, asyncio.Semaphore(config.concurrency))
+        return client
+
+    async def request(self, service: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Sends a request with the service's concurrency cap, retrying transport
+        errors and 429/5xx responses with exponential backoff. The cap only
+        covers requests in flight, not backoff sleeps. The last response (or
+        error) is returned (or raised) once retries run out.
+        """
+        config = self._services[service]
+        client = self.client(service)
+        for attempt in range(config.retries + 1):
+            delay = config.backoff * 2 ** attempt
+            try:
+                async with self._semaphores[service]:
+                    with outbound_timer(service) as outcome:
+                        response = await client.request(method, url, **kwargs)
+                        outcome["status"] = str(response.status_code)
+            except httpx.TransportError as e:
+                if attempt == config.retries:
+                    raise
+                logger.warning(f"[HTTP] {service} {type(e).__name__}, retry {attempt + 1} in {delay:.1f}s")
+            else:
+                if response.status_code not in _RETRY_STATUSES or attempt == config.retries:
+                    return response
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, min(float(retry_after), 30.0))
+                logger.warning(
+                    f"[HTTP] {service} HTTP {response.status_code}, retry {attempt + 1} in {delay:.1f}s"
+                )
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def get(self, service: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request(service, "GET", url, **kwargs)
+
+
+http_clients = HttpClientRegistry(_SERVICES)
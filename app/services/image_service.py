@@ -1,18 +1,23 @@
+import asyncio
 import logging
 from typing import Optional
 
-import httpx
-
 from app.core.config import settings
+from app.services.http_clients import http_clients
+from app.services.singleflight import SingleFlight
+from app.utils import normalize_name
 
 logger = logging.getLogger(__name__)
 
 _UNSPLASH_URL = "https://api.unsplash.com/search/photos"
 
+_flight = SingleFlight()
+
 
-async def _search_unsplash(query: str, client: httpx.AsyncClient) -> Optional[str]:
+async def _search_unsplash(query: str) -> Optional[str]:
    
-    response = await client.get(
+    response = await http_clients.get(
+        "unsplash",
         _UNSPLASH_URL,
         params={
             "query": query,
@@ -32,11 +37,23 @@ async def _search_unsplash(query: str, client: httpx.AsyncClient) -> Optional[st
     return results[0].get("urls", {}).get("regular")
 
 
+async def _search_labelled(query: str) -> tuple[str, Optional[str]]:
+    return query, await _search_unsplash(query)
+
+
 async def fetch_animal_image_url(animal_name: str) -> Optional[str]:
+    """
+    Races the fallback queries concurrently; the first one to return a
+    photo wins and the rest are cancelled. Raises only if every query failed.
+    Concurrent lookups of the same name share one race.
+    """
     if not settings.UNSPLASH_ACCESS_KEY:
         logger.warning("[Image] UNSPLASH_ACCESS_KEY is not defined, skipping image.")
         return None
+    return await _flight.do(normalize_name(animal_name), lambda: _race_queries(animal_name))
 
+
+async def _race_queries(animal_name: str) -> Optional[str]:
     queries = [
         animal_name, 
         f"{animal_name} animal",              
@@ -44,17 +61,24 @@ async def fetch_animal_image_url(animal_name: str) -> Optional[str]:
                                  
     ]
 
+    tasks = [asyncio.create_task(_search_labelled(query)) for query in queries]
+    errors: list[Exception] = []
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for query in queries:
-                url = await _search_unsplash(query, client)
-                if url:
-                    logger.info(f"[Image] '{animal_name}' → query='{query}' → {url[:70]}...")
-                    return url
-
-        logger.warning(f"[Image] No Unsplash results found for '{animal_name}' in any query.")
-        return None
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                query, url = await next_done
+            except Exception as e:
+                logger.warning(f"[Image] Unsplash error for '{animal_name}': {e}")
+                errors.append(e)
+                continue
+            if url:
+                logger.info(f"[Image] '{animal_name}' → query='{query}' → {url[:70]}...")
+                return url
+    finally:
+        for task in tasks:
+            task.cancel()
 
-    except Exception as e:
-        logger.warning(f"[Image] Unsplash error for '{animal_name}': {e}")
-        return None
+    if len(errors) == len(tasks):
+        raise errors[0]
+    logger.warning(f"[Image] No Unsplash results found for '{animal_name}' in any query.")
+    return None
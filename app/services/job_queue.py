@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import JOBS_PROCESSED
+from app.db.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+JobHandler = Callable[[int], Awaitable[None]]  # receives the job's animal_id
+# Receives many animal_ids at once and returns the ones that failed.
+BatchJobHandler = Callable[[list[int]], Awaitable[dict[int, Exception]]]
+
+
+@dataclass
+class ClaimedJob:
+    id: int
+    kind: str
+    animal_id: int
+    attempts: int
+
+
+_CLAIM = text("""
+    UPDATE enrichment_jobs
+    SET status = 'running', attempts = attempts + 1, locked_at = now(), updated_at = now()
+    WHERE id IN (
+        SELECT id FROM enrichment_jobs
+        WHERE status = 'pending' AND run_after <= now() AND kind = ANY(:kinds)
+        ORDER BY run_after, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, animal_id, attempts;
+""")
+
+_COMPLETE = text("""
+    UPDATE enrichment_jobs
+    SET status = 'done', last_error = NULL, locked_at = NULL, updated_at = now()
+    WHERE id = ANY(:job_ids);
+""")
+
+_FAIL = text("""
+    UPDATE enrichment_jobs
+    SET status = :status, last_error = :error, locked_at = NULL, updated_at = now(),
+        run_after = now() + make_interval(secs => :delay)
+    WHERE id = :job_id;
+""")
+
+# Jobs left 'running' by a crashed process go back in the queue once their lease expires.
+_RESUME_STALE = text("""
+    UPDATE enrichment_jobs
+    SET status = 'pending', locked_at = NULL, run_after = now()
+    WHERE status = 'running' AND locked_at < now() - make_interval(secs => :lease);
+""")
+
+# Jobs this process claimed but did not finish (shutdown, failed completion
+# write) go straight back; the interrupted attempt does not count.
+_RELEASE = text("""
+    UPDATE enrichment_jobs
+    SET status = 'pending', attempts = greatest(attempts - 1, 0), locked_at = NULL,
+        run_after = now(), updated_at = now()
+    WHERE id = ANY(:job_ids) AND status = 'running';
+""")
+
+_COUNTS = text("""
+    SELECT kind, status, count(*) AS n FROM enrichment_jobs GROUP BY kind, status;
+""")
+
+
+class JobQueue:
+    """
+    Postgres-backed queue over `enrichment_jobs`. A fixed pool of workers
+    claims rows with `FOR UPDATE SKIP LOCKED`, so several processes can
+    share the table. Failures are retried with exponential backoff until
+    `max_attempts`, then left as 'failed' with the last error.
+
+    Batch handlers receive up to `batch_size` jobs of their kind per call.
+    Jobs in flight are released on `stop()`; jobs of a process that died
+    are reclaimed by a lease reaper the workers run every `reap_interval`.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_attempts: int,
+        backoff: float,
+        poll_interval: float,
+        lease: float,
+        reap_interval: float,
+    ) -> None:
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.reap_interval = reap_interval
+        self._next_reap = 0.0
+        self._claimed: set[int] = set()  # job ids this process holds as 'running'
+        self._handlers: dict[str, tuple[BatchJobHandler, int]] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        async def run_each(animal_ids: list[int]) -> dict[int, Exception]:
+            failures: dict[int, Exception] = {}
+            for animal_id in animal_ids:
+                try:
+                    await handler(animal_id)
+                except Exception as e:
+                    failures[animal_id] = e
+            return failures
+
+        self._handlers[kind] = (run_each, 1)
+
+    def register_batch(self, kind: str, handler: BatchJobHandler, batch_size: int) -> None:
+        self._handlers[kind] = (handler, batch_size)
+
+    def notify(self) -> None:
+        """Wakes idle workers; call after committing new jobs."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        await self._reap()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._claimed:
+            try:
+                await self._release(list(self._claimed))
+            except Exception as e:
+                logger.error(f"[Jobs] Could not release {len(self._claimed)} job(s) on shutdown: {e}")
+
+    async def _reap(self) -> None:
+        self._next_reap = time.monotonic() + self.reap_interval
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(_RESUME_STALE, {"lease": self.lease})
+            await session.commit()
+        if result.rowcount:
+            logger.info(f"[Jobs] Resumed {result.rowcount} interrupted job(s).")
+
+    async def _release(self, job_ids: list[int]) -> None:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(_RELEASE, {"job_ids": job_ids})
+            await session.commit()
+        self._claimed.difference_update(job_ids)
+        if result.rowcount:
+            logger.info(f"[Jobs] Released {result.rowcount} unfinished job(s) back to the queue.")
+
+    async def stats(self) -> dict[str, dict[str, int]]:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(_COUNTS)).fetchall()
+        counts: dict[str, dict[str, int]] = {}
+        for row in rows:
+            counts.setdefault(row.kind, {})[row.status] = row.n
+        return counts
+
+    # ── WORKERS ───────────────────────────────────────────────────────────────
+    async def _claim(self, kinds: list[str], limit: int) -> list[ClaimedJob]:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(_CLAIM, {"kinds": kinds, "limit": limit})).fetchall()
+            await session.commit()
+        self._claimed.update(row.id for row in rows)
+        return [ClaimedJob(row.id, row.kind, row.animal_id, row.attempts) for row in rows]
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            if time.monotonic() >= self._next_reap:
+                try:
+                    await self._reap()
+                except Exception as e:
+                    logger.error(f"[Jobs] Worker {n} could not reap stale jobs: {e}")
+            jobs: list[ClaimedJob] = []
+            try:
+                jobs = await self._claim(list(self._handlers), 1)
+                if jobs and self._handlers[jobs[0].kind][1] > 1:
+                    jobs += await self._claim([jobs[0].kind], self._handlers[jobs[0].kind][1] - 1)
+            except Exception as e:
+                logger.error(f"[Jobs] Worker {n} could not claim a job: {e}")
+                if jobs:  # the batch top-up failed after the first claim committed
+                    try:
+                        await self._release([job.id for job in jobs])
+                    except Exception:
+                        pass  # still 'running': the lease reaper picks them up
+                jobs = []
+            if not jobs:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(jobs)
+            except Exception as e:
+                job_ids = [job.id for job in jobs]
+                logger.error(f"[Jobs] Worker {n} could not record job ids={job_ids}: {e}", exc_info=True)
+                try:
+                    await self._release(job_ids)
+                except Exception:
+                    pass  # still 'running': the lease reaper picks them up
+
+    async def _run(self, jobs: list[ClaimedJob]) -> None:
+        handler, _ = self._handlers[jobs[0].kind]
+        try:
+            failures = await handler([job.animal_id for job in jobs])
+        except Exception as e:
+            failures = {job.animal_id: e for job in jobs}
+
+        async with AsyncSessionLocal() as session:
+            done = [job.id for job in jobs if job.animal_id not in failures]
+            if done:
+                await session.execute(_COMPLETE, {"job_ids": done})
+            JOBS_PROCESSED.labels(jobs[0].kind, "done").inc(len(done))
+            for job in jobs:
+                error = failures.get(job.animal_id)
+                if error is None:
+                    continue
+                final = job.attempts >= self.max_attempts
+                JOBS_PROCESSED.labels(job.kind, "failed" if final else "retry").inc()
+                delay = 0.0 if final else self.backoff * 2 ** (job.attempts - 1)
+                logger.error(
+                    f"[Jobs] {job.kind} job id={job.id} attempt {job.attempts} failed: {error}"
+                    + ("" if final else f" (retry in {delay:.0f}s)")
+                )
+                await session.execute(_FAIL, {
+                    "job_id": job.id,
+                    "status": "failed" if final else "pending",
+                    "error": str(error),
+                    "delay": delay,
+                })
+            await session.commit()
+        self._claimed.difference_update(job.id for job in jobs)
+
+
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    backoff=settings.JOB_BACKOFF_SECONDS,
+    poll_interval=settings.JOB_POLL_SECONDS,
+    lease=settings.JOB_LEASE_SECONDS,
+    reap_interval=settings.JOB_REAP_SECONDS,
+)
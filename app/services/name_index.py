@@ -0,0 +1,136 @@
+import logging
+from bisect import bisect_left, insort
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Animal
+from app.utils import normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+# Match kinds, best first: whole name, later word of the name, whole
+# scientific name, later word of the scientific name.
+_NAME, _NAME_WORD, _SCI, _SCI_WORD = range(4)
+
+# Upper bound on entries ranked per query, so one-letter prefixes stay fast.
+_MAX_CANDIDATES = 1000
+
+# Called after every mutation with (kind, new version, animal_id); kind is
+# "load", "add" (also a replacement) or "remove".
+NameListener = Callable[[str, int, Optional[int]], None]
+
+
+def _keys(name: str, kind: int, word_kind: int) -> list[tuple[str, int]]:
+    words = normalize_name(name).split(" ")
+    return [(" ".join(words[i:]), kind if i == 0 else word_kind) for i in range(len(words)) if words[i]]
+
+
+class NameIndex:
+    """
+    Sorted (key, kind, id) entries over every animal's name and scientific
+    name, plus each of their word suffixes ("african lion" → "lion"), so a
+    prefix lookup is one bisect and a short forward scan.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[str, int, int]] = []
+        self._names: dict[int, tuple[str, Optional[str]]] = {}
+        self.version = 0
+        self._listeners: list[NameListener] = []
+
+    def add_listener(self, listener: NameListener) -> None:
+        self._listeners.append(listener)
+
+    def _changed(self, kind: str, animal_id: Optional[int] = None) -> None:
+        self.version += 1
+        for listener in self._listeners:
+            listener(kind, self.version, animal_id)
+
+    # ── BUILD ─────────────────────────────────────────────────────────────────
+    def load(self, rows: Iterable[tuple[int, str, Optional[str]]]) -> None:
+        self._names = {animal_id: (name, scientific_name) for animal_id, name, scientific_name in rows}
+        self._entries = sorted(
+            (key, kind, animal_id)
+            for animal_id, (name, scientific_name) in self._names.items()
+            for key, kind in self._entry_keys(name, scientific_name)
+        )
+        self._changed("load")
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        result = await db.execute(select(Animal.id, Animal.name, Animal.scientific_name))
+        self.load(result.tuples().all())
+        logger.info(f"[Search] Name index rebuilt with {len(self._entries)} keys for {len(self._names)} animals.")
+
+    @staticmethod
+    def _entry_keys(name: str, scientific_name: Optional[str]) -> list[tuple[str, int]]:
+        keys = _keys(name, _NAME, _NAME_WORD)
+        if scientific_name:
+            keys += _keys(scientific_name, _SCI, _SCI_WORD)
+        return keys
+
+    # ── MUTATIONS ─────────────────────────────────────────────────────────────
+    def add(self, animal_id: int, name: str, scientific_name: Optional[str] = None) -> None:
+        """Inserts or replaces an animal's keys (e.g. a taxon promoted to species)."""
+        self._discard(animal_id)
+        self._names[animal_id] = (name, scientific_name)
+        for key, kind in self._entry_keys(name, scientific_name):
+            insort(self._entries, (key, kind, animal_id))
+        self._changed("add", animal_id)
+
+    def remove(self, animal_id: int) -> None:
+        if self._discard(animal_id):
+            self._changed("remove", animal_id)
+
+    def _discard(self, animal_id: int) -> bool:
+        names = self._names.pop(animal_id, None)
+        if names is None:
+            return False
+        for key, kind in self._entry_keys(*names):
+            i = bisect_left(self._entries, (key, kind, animal_id))
+            if i < len(self._entries) and self._entries[i] == (key, kind, animal_id):
+                del self._entries[i]
+        return True
+
+    # ── QUERIES ───────────────────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def names(self, animal_id: int) -> tuple[str, Optional[str]]:
+        return self._names[animal_id]
+
+    def get(self, animal_id: int) -> Optional[tuple[str, Optional[str]]]:
+        return self._names.get(animal_id)
+
+    def is_species(self, animal_id: int) -> bool:
+        names = self._names.get(animal_id)
+        return names is not None and bool(names[1])
+
+    def species_ids(self) -> list[int]:
+        """Ids with a scientific name, i.e. species rather than taxon nodes."""
+        return [animal_id for animal_id, (_, scientific_name) in self._names.items() if scientific_name]
+
+    def prefix(self, query: str, limit: int) -> list[int]:
+        """
+        Ids whose name, scientific name or any later word starts with
+        `query`. Exact matches rank first, then by match kind, then shorter
+        names.
+        """
+        q = normalize_name(query)
+        if not q:
+            return []
+        best: dict[int, tuple[bool, int, int]] = {}
+        i = bisect_left(self._entries, (q,))
+        end = min(len(self._entries), i + _MAX_CANDIDATES)
+        while i < end and self._entries[i][0].startswith(q):
+            key, kind, animal_id = self._entries[i]
+            rank = (key != q, kind, len(self._names[animal_id][0]))
+            if animal_id not in best or rank < best[animal_id]:
+                best[animal_id] = rank
+            i += 1
+        return sorted(best, key=best.__getitem__)[:limit]
+
+
+name_index = NameIndex()
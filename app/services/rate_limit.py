@@ -0,0 +1,23 @@
+import asyncio
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """Sliding one-minute window; `acquire` waits until a slot is free."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.per_minute = per_minute
+        self._calls: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= 60.0:
+                    self._calls.popleft()
+                if len(self._calls) < self.per_minute:
+                    self._calls.append(now)
+                    return
+                await asyncio.sleep(60.0 - (now - self._calls[0]))
@@ -0,0 +1,303 @@
+import logging
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from app.services.name_index import NameIndex, name_index
+from app.services.taxonomy_index import TaxonomyIndex, taxonomy_index
+
+logger = logging.getLogger(__name__)
+
+
+# Labels stay below this. A full rebuild spaces the nodes over 1/_CHILD_SHARE
+# of it; the rest is for roots and clades orphaned by deletes.
+_LABEL_LIMIT = 1 << 62
+# A node added later takes 1/_CHILD_SHARE of its parent's remaining spare labels.
+_CHILD_SHARE = 64
+
+
+class Relative(NamedTuple):
+    id: int
+    common_ancestor_id: int
+    animal_distance: int    # steps from the queried animal up to the common ancestor
+    relative_distance: int  # steps from the relative up to the common ancestor
+
+    @property
+    def total_distance(self) -> int:
+        return self.animal_distance + self.relative_distance
+
+
+class RelativesIndex:
+    """
+    Nearest-relatives engine over the taxonomy index. Every node owns a
+    label interval [tin, end) that contains the labels of all of its
+    descendants, so a clade is one interval; species are bucketed by depth
+    and sorted by label, so "species at depth d inside clade A" is two
+    binary searches.
+
+    A species at depth d whose LCA with X is X's j-th ancestor A sits at
+    distance j + (d - depth(A)), the same steps `get_common_ancestor`
+    reports. Queries walk total distance D = 1, 2, ... and, within each D,
+    ancestors from the deepest up, so results come out ranked by distance,
+    then deeper common ancestor, then id, without scanning the tree.
+
+    Labels are spaced out, so a node added later takes spare labels from
+    its parent's range and nothing else moves. Writes are applied through
+    the index listeners; removals cut the clade out of the buckets. A full
+    recompute only happens on the next query after either index is
+    reloaded, or in the rare case that a parent runs out of spare labels.
+    """
+
+    def __init__(self, index: TaxonomyIndex, names: NameIndex) -> None:
+        self._index = index
+        self._names = names
+        self._tree_version: Optional[int] = None
+        self._names_version: Optional[int] = None
+        self._position: dict[int, int] = {}
+        # Per position, grown by doubling; entries of removed nodes stay behind, unreferenced.
+        self._count = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._tin = np.empty(0, dtype=np.int64)
+        self._end = np.empty(0, dtype=np.int64)
+        self._free = np.empty(0, dtype=np.int64)      # next unused label for a new child
+        self._free_end = np.empty(0, dtype=np.int64)  # end of the node's spare labels
+        self._depth = np.empty(0, dtype=np.int64)
+        self._next_label = 0
+        self._by_depth: list[tuple[np.ndarray, np.ndarray]] = []  # (sorted labels, ids) of species per depth
+        index.add_listener(self._on_tree_change)
+        names.add_listener(self._on_names_change)
+
+    def _current(self) -> bool:
+        return self._tree_version == self._index.version and self._names_version == self._names.version
+
+    # ── FULL BUILD ────────────────────────────────────────────────────────────
+    def _compute(self) -> None:
+        ids, parent, depth = self._index.forest_arrays()
+        n = len(ids)
+        size = np.ones(n, dtype=np.int64)
+        order_no = np.zeros(n, dtype=np.int64)
+        levels = [np.flatnonzero(depth == d) for d in range(int(depth.max(initial=-1)) + 1)]
+
+        # Bottom-up subtree sizes.
+        for d in range(len(levels) - 1, 0, -1):
+            np.add.at(size, parent[levels[d]], size[levels[d]])
+
+        # Top-down pre-order numbers: a node comes right after its parent,
+        # after the subtrees of its lower-id siblings.
+        for d, nodes in enumerate(levels):
+            groups = parent[nodes] if d > 0 else np.zeros(len(nodes), dtype=np.int64)
+            sort = np.lexsort((ids[nodes], groups))
+            order, groups = nodes[sort], groups[sort]
+            offset = np.cumsum(size[order]) - size[order]
+            first = np.r_[True, groups[1:] != groups[:-1]] if len(order) else np.empty(0, dtype=bool)
+            group_base = offset[np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))]
+            order_no[order] = (order_no[parent[order]] + 1 if d > 0 else 0) + offset - group_base
+
+        # Every node owns `spacing` labels starting at its own; the spare
+        # ones after it are handed out to children added later.
+        spacing = max(2, _LABEL_LIMIT // (_CHILD_SHARE * (n + 1)))
+        tin = order_no * spacing
+
+        is_species = np.isin(ids, np.array(self._names.species_ids(), dtype=np.int64))
+        self._by_depth = []
+        for nodes in levels:
+            chosen = nodes[is_species[nodes]]
+            chosen = chosen[np.argsort(tin[chosen], kind="stable")]
+            self._by_depth.append((tin[chosen], ids[chosen]))
+
+        self._position = {int(node_id): i for i, node_id in enumerate(ids)}
+        self._count = n
+        self._ids, self._depth, self._tin = ids.copy(), depth.copy(), tin
+        self._end = tin + size * spacing
+        self._free, self._free_end = tin + 1, tin + spacing
+        self._next_label = n * spacing
+        self._tree_version, self._names_version = self._index.version, self._names.version
+        logger.info(f"[Relatives] Indexed {int(is_species.sum())} species across {len(levels)} levels.")
+
+    def _invalidate(self) -> None:
+        self._tree_version = None
+
+    # ── BUCKETS ───────────────────────────────────────────────────────────────
+    def _insert_species(self, pos: int) -> None:
+        depth, label = int(self._depth[pos]), self._tin[pos]
+        while len(self._by_depth) <= depth:
+            self._by_depth.append((np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)))
+        labels, species = self._by_depth[depth]
+        i = int(np.searchsorted(labels, label))
+        if i < len(labels) and labels[i] == label:
+            return
+        self._by_depth[depth] = (np.insert(labels, i, label), np.insert(species, i, self._ids[pos]))
+
+    def _drop_species(self, pos: int) -> None:
+        depth = int(self._depth[pos])
+        if depth < len(self._by_depth):
+            self._take(depth, int(self._tin[pos]), int(self._tin[pos]) + 1)
+
+    def _take(self, depth: int, lo: int, hi: int) -> tuple[np.ndarray, np.ndarray]:
+        """Removes and returns the bucket entries at `depth` labelled within [lo, hi)."""
+        labels, species = self._by_depth[depth]
+        i, j = np.searchsorted(labels, [lo, hi])
+        taken = labels[i:j], species[i:j]
+        if j > i:
+            self._by_depth[depth] = (np.delete(labels, np.s_[i:j]), np.delete(species, np.s_[i:j]))
+        return taken
+
+    def _put(self, depth: int, labels: np.ndarray, species: np.ndarray) -> None:
+        current_labels, current_species = self._by_depth[depth]
+        at = np.searchsorted(current_labels, labels)
+        self._by_depth[depth] = (np.insert(current_labels, at, labels), np.insert(current_species, at, species))
+
+    # ── INCREMENTAL UPDATES ───────────────────────────────────────────────────
+    def _on_tree_change(self, kind: str, version: int, node_id: Optional[int], parent_id: Optional[int]) -> None:
+        if self._tree_version != version - 1 or self._names_version != self._names.version:
+            return  # already stale; the next query recomputes
+        if kind == "add" and node_id is not None:
+            applied = self._add_node(node_id, parent_id)
+        elif kind in ("remove", "reparent") and node_id in self._position:
+            applied = self._remove_node(node_id, reparent=kind == "reparent")
+        elif kind == "remove_subtree" and node_id in self._position:
+            applied = self._remove_subtree(node_id)
+        else:
+            applied = kind == "touch"
+        if applied:
+            self._tree_version = version
+
+    def _on_names_change(self, kind: str, version: int, animal_id: Optional[int]) -> None:
+        if self._names_version != version - 1 or self._tree_version != self._index.version or kind == "load":
+            return
+        pos = self._position.get(animal_id)
+        if pos is not None:
+            if kind == "add" and self._names.is_species(animal_id):
+                self._insert_species(pos)
+            else:
+                self._drop_species(pos)
+        self._names_version = version
+
+    def _append(self, node_id: int, tin: int, end: int, depth: int) -> int:
+        if self._count == len(self._ids):
+            capacity = max(16, 2 * self._count)
+            for name in ("_ids", "_tin", "_end", "_free", "_free_end", "_depth"):
+                grown = np.zeros(capacity, dtype=np.int64)
+                grown[:self._count] = getattr(self, name)[:self._count]
+                setattr(self, name, grown)
+        pos = self._count
+        self._count += 1
+        self._ids[pos], self._tin[pos], self._end[pos], self._depth[pos] = node_id, tin, end, depth
+        self._free[pos], self._free_end[pos] = tin + 1, end
+        self._position[node_id] = pos
+        return pos
+
+    def _add_node(self, node_id: int, parent_id: Optional[int]) -> bool:
+        """O(1) apart from the species bucket insert: no other label moves."""
+        if parent_id is None:
+            tin, depth = self._next_label, 0
+            end = tin + max(2, (_LABEL_LIMIT - tin) // _CHILD_SHARE)
+            self._next_label = end
+        else:
+            parent = self._position[parent_id]
+            tin, spare_end = int(self._free[parent]), int(self._free_end[parent])
+            if tin >= spare_end:
+                self._invalidate()  # the parent ran out of spare labels
+                return False
+            # Each new child takes a share of what is left, so it has room for its own children.
+            end = tin + max(1, (spare_end - tin) // _CHILD_SHARE)
+            self._free[parent] = end
+            depth = int(self._depth[parent]) + 1
+        if self._next_label > _LABEL_LIMIT:
+            self._invalidate()
+            return False
+        pos = self._append(node_id, tin, end, depth)
+        if self._names.is_species(node_id):
+            self._insert_species(pos)
+        return True
+
+    def _remove_node(self, node_id: int, reparent: bool) -> bool:
+        pos = self._position[node_id]
+        self._drop_species(pos)
+        del self._position[node_id]
+        start, end, depth = int(self._tin[pos]), int(self._end[pos]), int(self._depth[pos])
+
+        if reparent:
+            # Children stay inside the grandparent's interval, one level up.
+            offset, depth_shift = 0, -1
+        else:
+            # Children become roots: move their labels past every other tree.
+            offset, depth_shift = self._next_label - (start + 1), -(depth + 1)
+            self._next_label += end - start - 1
+            if self._next_label > _LABEL_LIMIT:
+                self._invalidate()
+                return False
+
+        live = slice(0, self._count)
+        inner = np.flatnonzero((self._tin[live] > start) & (self._tin[live] < end))
+        for column in (self._tin, self._end, self._free, self._free_end):
+            column[inner] += offset
+        self._depth[inner] += depth_shift
+        for d in range(depth + 1, len(self._by_depth)):
+            labels, species = self._take(d, start + 1, end)
+            if len(labels):
+                self._put(d + depth_shift, labels + offset, species)
+        return True
+
+    def _remove_subtree(self, node_id: int) -> bool:
+        pos = self._position[node_id]
+        start, end, depth = int(self._tin[pos]), int(self._end[pos]), int(self._depth[pos])
+        live = slice(0, self._count)
+        for inner in np.flatnonzero((self._tin[live] >= start) & (self._tin[live] < end)).tolist():
+            inner_id = int(self._ids[inner])
+            if self._position.get(inner_id) == inner:
+                del self._position[inner_id]
+        for d in range(depth, len(self._by_depth)):
+            self._take(d, start, end)
+        return True
+
+    # ── QUERIES ───────────────────────────────────────────────────────────────
+    def _species_in(self, depth: int, clade: int, exclude: Optional[int]) -> np.ndarray:
+        """Species ids at `depth` inside `clade`'s interval but outside `exclude`'s."""
+        labels, species = self._by_depth[depth]
+        lo, hi = np.searchsorted(labels, [self._tin[clade], self._end[clade]])
+        if exclude is None:
+            return species[lo:hi]
+        mid_lo, mid_hi = np.searchsorted(labels, [self._tin[exclude], self._end[exclude]])
+        return np.concatenate((species[lo:mid_lo], species[mid_hi:hi]))
+
+    def nearest(self, node_id: int, k: int, max_distance: Optional[int] = None) -> list[Relative]:
+        """
+        Up to `k` species closest to `node_id` (excluding itself), no
+        further than `max_distance` steps. Species in other trees of the
+        forest are never related.
+        """
+        if not self._current():
+            self._compute()
+
+        # chain[j] = position of the j-th ancestor; chain[0] is the node itself.
+        chain = [self._position[node_id]]
+        parent = self._index.parent(node_id)
+        while parent is not None:
+            chain.append(self._position[parent])
+            parent = self._index.parent(parent)
+        node_depth = len(chain) - 1
+        max_depth = len(self._by_depth) - 1
+
+        limit = node_depth + max_depth
+        if max_distance is not None:
+            limit = min(limit, max_distance)
+
+        found: list[Relative] = []
+        for total in range(1, limit + 1):
+            for j in range(min(total, node_depth) + 1):
+                depth = node_depth - j + (total - j)
+                if depth > max_depth:
+                    continue
+                clade = chain[j]
+                species = self._species_in(depth, clade, chain[j - 1] if j else None)
+                if not len(species):
+                    continue
+                ancestor_id = int(self._ids[clade])
+                found.extend(Relative(int(s), ancestor_id, j, total - j) for s in np.sort(species))
+                if len(found) >= k:
+                    return found[:k]
+        return found
+
+
+relatives_index = RelativesIndex(taxonomy_index, name_index)
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+from app.core.config import settings
+from app.services.cache import TTLCache
+
+
+# Keys: ("animal", id) and ("lineage", id); values are the serialized JSON
+# bodies of AnimalRead / LineageResponse, so hits skip validation entirely.
+# The TTL only bounds staleness from writers in *other* processes; writes
+# in this process invalidate exactly via `invalidate_animals`.
+response_cache = TTLCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+# ── FILL GENERATIONS ─────────────────────────────────────────────────────────
+# A miss reads `generation(id)` before querying and fills through `store`,
+# which drops the body if the id was invalidated in between; otherwise a
+# read that started before a write could re-cache the pre-write row.
+# Each invalidation stamps the id with the next value of `_counter`. Only the
+# most recent stamps are kept: an evicted id reports `_floor`, which is at
+# least its own last stamp, so an in-flight fill for it still gets dropped.
+_generations: OrderedDict[int, int] = OrderedDict()
+_counter = 0
+_floor = 0
+
+
+def generation(animal_id: int) -> int:
+    return _generations.get(animal_id, _floor)
+
+
+def store(key: Hashable, body: bytes, fill_generation: int) -> None:
+    """Caches `body` under ("animal" | "lineage", id) unless the id changed since `fill_generation`."""
+    if generation(key[1]) == fill_generation:
+        response_cache.set(key, body)
+
+
+def invalidate_animals(animal_ids: Iterable[int]) -> None:
+    """Drops the cached detail and lineage responses of each id."""
+    global _counter, _floor
+    for animal_id in animal_ids:
+        response_cache.delete(("animal", animal_id))
+        response_cache.delete(("lineage", animal_id))
+        _counter += 1
+        _generations[animal_id] = _counter
+        _generations.move_to_end(animal_id)
+    while len(_generations) > settings.RESPONSE_CACHE_MAX_ENTRIES:
+        _, _floor = _generations.popitem(last=False)
+
+
+def clear_responses() -> None:
+    """Drops every cached response and any fill still in flight."""
+    global _counter, _floor
+    response_cache.clear()
+    _generations.clear()
+    _counter += 1
+    _floor = _counter
@@ -0,0 +1,293 @@
+import logging
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Animal
+
+logger = logging.getLogger(__name__)
+
+# Called after every mutation with (kind, new version, node_id, parent_id);
+# kind is "load", "add", "touch", "remove" (children become roots),
+# "reparent" (children move to parent_id) or "remove_subtree".
+IndexListener = Callable[[str, int, Optional[int], Optional[int]], None]
+
+
+class TaxonomyIndex:
+    """
+    In-process copy of the (id, ancestor_id) forest with binary-lifting
+    jump tables, so LCA / depth / distance queries never touch Postgres.
+
+    `_up[v][k]` is the 2^k-th ancestor of v; the list stops at the root.
+    Every mutation bumps `version` and is reported to the listeners.
+    `stale` is set when a change could not be applied locally (its parent
+    was written by another worker) and cleared by the next `rebuild`.
+    """
+
+    def __init__(self) -> None:
+        self._parent: dict[int, Optional[int]] = {}
+        self._children: dict[int, set[int]] = {}
+        self._depth: dict[int, int] = {}
+        self._up: dict[int, list[int]] = {}
+        self.version: int = 0
+        self.stale = False
+        self._arrays: Optional[tuple[int, dict[int, int], np.ndarray, np.ndarray, np.ndarray]] = None
+        self._listeners: list[IndexListener] = []
+
+    def add_listener(self, listener: IndexListener) -> None:
+        self._listeners.append(listener)
+
+    def _changed(self, kind: str, node_id: Optional[int] = None, parent_id: Optional[int] = None) -> None:
+        self.version += 1
+        for listener in self._listeners:
+            listener(kind, self.version, node_id, parent_id)
+
+    # ── BUILD ─────────────────────────────────────────────────────────────────
+    def load(self, pairs: Iterable[tuple[int, Optional[int]]]) -> None:
+        self._parent = {}
+        self._children = {}
+        for node_id, parent_id in pairs:
+            self._parent[node_id] = parent_id
+            self._children.setdefault(node_id, set())
+        for node_id, parent_id in self._parent.items():
+            if parent_id is not None:
+                self._children.setdefault(parent_id, set()).add(node_id)
+
+        self._depth = {}
+        self._up = {}
+        roots = [n for n, p in self._parent.items() if p is None or p not in self._parent]
+        for root in roots:
+            self._parent[root] = None
+            self._index_subtree(root)
+        self._changed("load")
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        # Cleared before reading, so a node skipped while the query runs marks it stale again.
+        self.stale = False
+        result = await db.execute(select(Animal.id, Animal.ancestor_id))
+        self.load(result.tuples().all())
+        logger.info(f"[Index] Taxonomy index rebuilt with {len(self._parent)} nodes.")
+
+    def _index_subtree(self, root: int) -> None:
+        # Parents are always indexed before their children, so each jump
+        # table can be derived from the already-complete ancestor tables.
+        stack = [root]
+        while stack:
+            node_id = stack.pop()
+            self._index_node(node_id)
+            stack.extend(self._children.get(node_id, ()))
+
+    def _index_node(self, node_id: int) -> None:
+        parent_id = self._parent[node_id]
+        if parent_id is None:
+            self._depth[node_id] = 0
+            self._up[node_id] = []
+            return
+        self._depth[node_id] = self._depth[parent_id] + 1
+        jumps: list[int] = [parent_id]
+        k = 0
+        while k < len(self._up[jumps[k]]):
+            jumps.append(self._up[jumps[k]][k])
+            k += 1
+        self._up[node_id] = jumps
+
+    # ── MUTATIONS ─────────────────────────────────────────────────────────────
+    def add(self, node_id: int, parent_id: Optional[int]) -> None:
+        if node_id in self._parent:
+            return
+        if parent_id is not None and parent_id not in self._parent:
+            # Not a root: leaving it out makes lookups miss and reload the lineage.
+            logger.warning(f"[Index] Parent {parent_id} of node {node_id} is not indexed; index marked stale.")
+            self.stale = True
+            return
+        self._parent[node_id] = parent_id
+        self._children[node_id] = set()
+        if parent_id is not None:
+            self._children[parent_id].add(node_id)
+        self._index_node(node_id)
+        self._changed("add", node_id, parent_id)
+
+    def touch(self) -> None:
+        """Marks a non-structural change (e.g. a taxon promoted to species)."""
+        self._changed("touch")
+
+    def remove(self, node_id: int, reparent: bool = False) -> None:
+        """
+        Drops one node. By default this mirrors `ondelete="SET NULL"` and
+        its children become roots; with `reparent` they move up to its parent.
+        """
+        if node_id not in self._parent:
+            return
+        parent_id = self._parent.pop(node_id)
+        if parent_id is not None:
+            self._children[parent_id].discard(node_id)
+        new_parent = parent_id if reparent else None
+        for child_id in self._children.pop(node_id, set()):
+            self._parent[child_id] = new_parent
+            if new_parent is not None:
+                self._children[new_parent].add(child_id)
+            self._index_subtree(child_id)
+        self._depth.pop(node_id, None)
+        self._up.pop(node_id, None)
+        self._changed("reparent" if reparent else "remove", node_id, parent_id)
+
+    def remove_subtree(self, node_id: int) -> None:
+        """Drops a node and all of its descendants."""
+        if node_id not in self._parent:
+            return
+        parent_id = self._parent[node_id]
+        if parent_id is not None:
+            self._children[parent_id].discard(node_id)
+        for descendant_id in self.subtree(node_id):
+            del self._parent[descendant_id]
+            self._children.pop(descendant_id, None)
+            self._depth.pop(descendant_id, None)
+            self._up.pop(descendant_id, None)
+        self._changed("remove_subtree", node_id, parent_id)
+
+    # ── QUERIES ───────────────────────────────────────────────────────────────
+    def __contains__(self, node_id: int) -> bool:
+        return node_id in self._parent
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def parent(self, node_id: int) -> Optional[int]:
+        return self._parent[node_id]
+
+    def children(self, node_id: int) -> list[int]:
+        return sorted(self._children.get(node_id, ()))
+
+    def depth(self, node_id: int) -> int:
+        return self._depth[node_id]
+
+    def subtree(self, node_id: int) -> list[int]:
+        """The node and all of its descendants."""
+        nodes, stack = [], [node_id]
+        while stack:
+            current = stack.pop()
+            nodes.append(current)
+            stack.extend(self._children.get(current, ()))
+        return nodes
+
+    def _lift(self, node_id: int, steps: int) -> int:
+        k = 0
+        while steps:
+            if steps & 1:
+                node_id = self._up[node_id][k]
+            steps >>= 1
+            k += 1
+        return node_id
+
+    def lca(self, a: int, b: int) -> Optional[int]:
+        """Lowest common ancestor of a and b, or None if they sit in different trees."""
+        if self._depth[a] < self._depth[b]:
+            a, b = b, a
+        a = self._lift(a, self._depth[a] - self._depth[b])
+        if a == b:
+            return a
+        for k in range(len(self._up[a]) - 1, -1, -1):
+            if k < len(self._up[a]) and k < len(self._up[b]) and self._up[a][k] != self._up[b][k]:
+                a = self._up[a][k]
+                b = self._up[b][k]
+        if self._parent[a] is None or self._parent[a] != self._parent[b]:
+            return None
+        return self._parent[a]
+
+    def distances(self, a: int, b: int) -> Optional[tuple[int, int, int]]:
+        """Returns (lca_id, steps from a, steps from b), or None if unrelated."""
+        ancestor = self.lca(a, b)
+        if ancestor is None:
+            return None
+        anc_depth = self._depth[ancestor]
+        return ancestor, self._depth[a] - anc_depth, self._depth[b] - anc_depth
+
+    # ── VECTORIZED QUERIES ────────────────────────────────────────────────────
+    def _snapshot(self) -> tuple[dict[int, int], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Dense copy of the forest, rebuilt lazily once per `version`:
+        (id → position, ids, depth[pos], up[k, pos]). Roots point at
+        themselves in `up` so lifting past the top is a no-op.
+        """
+        if self._arrays is None or self._arrays[0] != self.version:
+            ids = np.fromiter(self._parent.keys(), dtype=np.int64, count=len(self._parent))
+            position = {int(node_id): i for i, node_id in enumerate(ids)}
+            depth = np.fromiter((self._depth[n] for n in self._parent), dtype=np.int64, count=len(ids))
+            levels = max(1, int(depth.max(initial=0)).bit_length())
+            up = np.empty((levels, len(ids)), dtype=np.int64)
+            up[0] = [
+                position[p] if p is not None else i
+                for i, p in enumerate(self._parent.values())
+            ]
+            for k in range(1, levels):
+                up[k] = up[k - 1][up[k - 1]]
+            self._arrays = (self.version, position, ids, depth, up)
+        return self._arrays[1:]
+
+    def forest_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(ids, parent position, depth); a root's parent position is its own."""
+        _, ids, depth, up = self._snapshot()
+        return ids, up[0], depth
+
+    def lca_inputs(self, node_ids: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (positions of `node_ids`, ids, depth, up) for `pairwise_lca`. Call it
+        on the event loop: refreshing the snapshot walks the live dicts. The
+        returned arrays are never mutated, so the lifting may run in a thread.
+        """
+        position, ids, depth, up = self._snapshot()
+        return np.array([position[n] for n in node_ids], dtype=np.int64), ids, depth, up
+
+    def lca_matrix(self, node_ids: list[int]) -> tuple[np.ndarray, np.ndarray]:
+        """Pairwise LCA ids and total distances for `node_ids`; see `pairwise_lca`."""
+        return pairwise_lca(*self.lca_inputs(node_ids))
+
+
+def pairwise_lca(
+    nodes: np.ndarray, ids: np.ndarray, depth: np.ndarray, up: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise LCA ids and total distances for the snapshot positions `nodes`,
+    as two n×n int64 matrices. Unrelated pairs get -1 in both.
+    """
+    rows, cols = np.triu_indices(len(nodes), k=1)
+    u, v = nodes[rows], nodes[cols]
+
+    # Lift the deeper node of every pair to the shallower one's depth.
+    swap = depth[u] < depth[v]
+    u, v = np.where(swap, v, u), np.where(swap, u, v)
+    diff = depth[u] - depth[v]
+    for k in range(up.shape[0]):
+        u = np.where((diff >> k) & 1 == 1, up[k][u], u)
+
+    for k in range(up.shape[0] - 1, -1, -1):
+        jump_u, jump_v = up[k][u], up[k][v]
+        moved = jump_u != jump_v
+        u = np.where(moved, jump_u, u)
+        v = np.where(moved, jump_v, v)
+
+    parent_u = up[0][u]
+    same = u == v
+    related = same | ((parent_u == up[0][v]) & (parent_u != u))
+    lca_pos = np.where(same, u, parent_u)
+
+    n = len(nodes)
+    lca = np.full((n, n), -1, dtype=np.int64)
+    dist = np.full((n, n), -1, dtype=np.int64)
+    pair_lca = np.where(related, ids[lca_pos], -1)
+    pair_dist = np.where(
+        related,
+        depth[nodes[rows]] + depth[nodes[cols]] - 2 * depth[lca_pos],
+        -1,
+    )
+    lca[rows, cols] = lca[cols, rows] = pair_lca
+    dist[rows, cols] = dist[cols, rows] = pair_dist
+    diagonal = np.arange(n)
+    lca[diagonal, diagonal] = ids[nodes]
+    dist[diagonal, diagonal] = 0
+    return lca, dist
+
+
+taxonomy_index = TaxonomyIndex()
@@ -0,0 +1,314 @@
+"""
+Whole-tree export/import as Newick or a compact binary snapshot.
+
+Binary layout ("EVOT" v1, little-endian):
+
+    header   struct "<4sHHI": magic, version, flags (0), node count n
+    ids      int32[n]
+    parents  int32[n]        0 for a root
+    names    uint32[n + 1] offsets, then the UTF-8 blob
+    sci      uint32[n + 1] offsets, then the UTF-8 blob ("" = NULL)
+"""
+import asyncio
+import logging
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.closure import BACKFILL_QUERY
+from app.db.database import engine
+from app.db.models import Animal
+
+logger = logging.getLogger(__name__)
+
+
+# (id, ancestor_id, name, scientific_name)
+TreeRow = tuple[int, Optional[int], str, Optional[str]]
+
+_MAGIC = b"EVOT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+
+_NEWICK_SPECIAL = set("()[]':;, \t\n_")
+
+_COPY_COLUMNS = ["id", "ancestor_id", "name", "scientific_name"]
+_RESET = text("TRUNCATE animals, animal_closure, enrichment_jobs RESTART IDENTITY CASCADE")
+_SYNC_SEQUENCE = text("SELECT setval(pg_get_serial_sequence('animals', 'id'), coalesce(max(id), 0) + 1, false) FROM animals")
+
+
+# ── READ ─────────────────────────────────────────────────────────────────────
+async def fetch_tree(db: AsyncSession) -> list[TreeRow]:
+    result = await db.execute(
+        select(Animal.id, Animal.ancestor_id, Animal.name, Animal.scientific_name).order_by(Animal.id)
+    )
+    return result.tuples().all()
+
+
+# ── BINARY ───────────────────────────────────────────────────────────────────
+def _le(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _string_table(strings: Iterable[str]) -> bytes:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("I", [0])
+    total = 0
+    for blob in encoded:
+        total += len(blob)
+        offsets.append(total)
+    return _le(offsets) + b"".join(encoded)
+
+
+def encode_binary(rows: list[TreeRow]) -> bytes:
+    ids = array("i", (row[0] for row in rows))
+    parents = array("i", (row[1] or 0 for row in rows))
+    return b"".join([
+        _HEADER.pack(_MAGIC, _VERSION, 0, len(rows)),
+        _le(ids),
+        _le(parents),
+        _string_table(row[2] for row in rows),
+        _string_table(row[3] or "" for row in rows),
+    ])
+
+
+def decode_binary(data: bytes) -> list[TreeRow]:
+    if len(data) < _HEADER.size:
+        raise ValueError("Not an EvoGraph tree snapshot: file too short.")
+    magic, version, _, n = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Not an EvoGraph tree snapshot (magic={magic!r}, version={version}).")
+    pos = _HEADER.size
+
+    def read_array(typecode: str, count: int) -> array:
+        nonlocal pos
+        values = array(typecode)
+        end = pos + count * values.itemsize
+        if end > len(data):
+            raise ValueError("Truncated tree snapshot.")
+        values.frombytes(data[pos:end])
+        if sys.byteorder == "big":
+            values.byteswap()
+        pos = end
+        return values
+
+    def read_strings() -> list[str]:
+        nonlocal pos
+        offsets = read_array("I", n + 1)
+        blob = data[pos:pos + offsets[-1]]
+        pos += offsets[-1]
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n)]
+
+    ids, parents = read_array("i", n), read_array("i", n)
+    names, scientific_names = read_strings(), read_strings()
+    return [
+        (ids[i], parents[i] or None, names[i], scientific_names[i] or None)
+        for i in range(n)
+    ]
+
+
+# ── NEWICK ───────────────────────────────────────────────────────────────────
+def _quote(label: str) -> str:
+    if not _NEWICK_SPECIAL.intersection(label):
+        return label
+    return "'" + label.replace("'", "''") + "'"
+
+
+def newick_chunks(rows: list[TreeRow], chunk_chars: int = 1 << 16) -> Iterator[str]:
+    """
+    Streams the forest as one Newick tree; several roots are wrapped in
+    an unnamed top-level clade. Children are ordered by id.
+    """
+    names = {row[0]: row[2] for row in rows}
+    children: dict[Optional[int], list[int]] = {}
+    for node_id, parent_id, _, _ in rows:
+        children.setdefault(parent_id if parent_id in names else None, []).append(node_id)
+    roots = children.get(None, [])
+
+    buffer: list[str] = []
+    size = 0
+
+    def emit(s: str) -> Optional[str]:
+        nonlocal size
+        buffer.append(s)
+        size += len(s)
+        if size >= chunk_chars:
+            chunk = "".join(buffer)
+            buffer.clear()
+            size = 0
+            return chunk
+        return None
+
+    # Iterative post-order over (closing, id): opening an inner node writes
+    # "(", closing it writes ")" and its label; leaves write just the label.
+    stack: list[tuple[bool, int]] = []
+    wrap = len(roots) != 1
+    if wrap:
+        buffer.append("(")
+    for root in reversed(roots):
+        stack.append((False, root))
+    first_at_level = [True]
+    while stack:
+        closing, node_id = stack.pop()
+        if closing:
+            out = emit(")" + _quote(names[node_id]))
+            first_at_level.pop()
+        else:
+            prefix = "" if first_at_level[-1] else ","
+            first_at_level[-1] = False
+            kids = children.get(node_id)
+            if kids:
+                out = emit(prefix + "(")
+                first_at_level.append(True)
+                stack.append((True, node_id))
+                stack.extend((False, kid) for kid in reversed(kids))
+            else:
+                out = emit(prefix + _quote(names[node_id]))
+        if out:
+            yield out
+    yield "".join(buffer) + (")" if wrap else "") + ";\n"
+
+
+def parse_newick(source: str) -> list[TreeRow]:
+    """
+    Parses a Newick tree into rows with fresh ids (1..n, pre-order).
+    Branch lengths and comments are ignored. Unnamed inner nodes get
+    "Unnamed clade N"; an unnamed top-level clade is unwrapped into roots.
+    """
+    rows: list[list] = []  # [id, parent_id, name]
+    stack: list[int] = []  # ids of the open clades
+    pending: Optional[int] = None  # node whose label may follow
+    i, n = 0, len(source)
+
+    def new_node() -> int:
+        rows.append([len(rows) + 1, stack[-1] if stack else None, None])
+        return len(rows)
+
+    while i < n:
+        ch = source[i]
+        if ch in " \t\r\n":
+            i += 1
+        elif ch == "[":
+            end = source.find("]", i)
+            if end < 0:
+                raise ValueError("Unterminated Newick comment.")
+            i = end + 1
+        elif ch == "(":
+            stack.append(new_node())
+            pending = None
+            i += 1
+        elif ch == ",":
+            pending = None
+            i += 1
+        elif ch == ")":
+            if not stack:
+                raise ValueError(f"Unbalanced ')' at offset {i}.")
+            pending = stack.pop()
+            i += 1
+        elif ch == ":":
+            i += 1
+            while i < n and source[i] not in ",);[":
+                i += 1
+        elif ch == ";":
+            break
+        else:
+            if ch == "'":
+                j, parts = i + 1, []
+                while True:
+                    end = source.find("'", j)
+                    if end < 0:
+                        raise ValueError("Unterminated quoted Newick label.")
+                    parts.append(source[j:end])
+                    if source.startswith("''", end):
+                        parts.append("'")
+                        j = end + 2
+                        continue
+                    i = end + 1
+                    break
+                label = "".join(parts)
+            else:
+                j = i
+                while i < n and source[i] not in "(),:;[ \t\r\n'":
+                    i += 1
+                label = source[j:i].replace("_", " ")
+            node_id = pending if pending is not None else new_node()
+            rows[node_id - 1][2] = label
+            pending = None
+    if stack:
+        raise ValueError("Unbalanced '(' in Newick input.")
+
+    if rows and rows[0][2] is None:
+        # Our own export wraps a forest in an unnamed root.
+        rows = [[node_id - 1, None if parent == 1 else parent - 1, name] for node_id, parent, name in rows[1:]]
+    unnamed = 0
+    for row in rows:
+        if row[2] is None:
+            unnamed += 1
+            row[2] = f"Unnamed clade {unnamed}"
+    return [(node_id, parent_id, name, None) for node_id, parent_id, name in rows]
+
+
+# ── LOAD ─────────────────────────────────────────────────────────────────────
+class TreeNotEmptyError(Exception):
+    """Raised by `load_tree` when animals exist and `replace` was not given."""
+
+
+def validate_tree(rows: list[TreeRow]) -> None:
+    """Rejects duplicate ids/names, dangling parents and cycles before anything is written."""
+    parent = {}
+    names: set[str] = set()
+    for node_id, parent_id, name, _ in rows:
+        if node_id <= 0 or node_id in parent:
+            raise ValueError(f"Invalid or duplicate id {node_id}.")
+        if not name or len(name) > 100:
+            raise ValueError(f"Node {node_id} needs a name of 1-100 characters.")
+        if name in names:
+            raise ValueError(f"Duplicate name '{name}'.")
+        names.add(name)
+        parent[node_id] = parent_id
+    state: dict[int, int] = {}  # 1 = on the current path, 2 = known to reach a root
+    for start in parent:
+        path = []
+        node: Optional[int] = start
+        while node is not None and state.get(node) != 2:
+            if node not in parent:
+                raise ValueError(f"Node {path[-1]} points at missing parent {node}.")
+            if state.get(node) == 1:
+                raise ValueError(f"Cycle through node {node}.")
+            state[node] = 1
+            path.append(node)
+            node = parent[node]
+        for visited in path:
+            state[visited] = 2
+
+
+async def load_tree(rows: list[TreeRow], replace: bool = False) -> int:
+    """
+    Bulk-loads `rows` with COPY and rebuilds the closure table, in one
+    transaction. The animals table must be empty unless `replace` is set,
+    which truncates it (and every table hanging off it) first.
+    """
+    await asyncio.to_thread(validate_tree, rows)
+    async with engine.begin() as conn:
+        if replace:
+            await conn.execute(_RESET)
+        elif await conn.scalar(text("SELECT EXISTS (SELECT 1 FROM animals)")):
+            raise TreeNotEmptyError("The animals table is not empty; pass replace to overwrite it.")
+        raw = await conn.get_raw_connection()
+        # COPY checks the self-referencing FK at the end of the statement, so row order is free.
+        await raw.driver_connection.copy_records_to_table(
+            "animals", records=rows, columns=_COPY_COLUMNS,
+        )
+        await conn.execute(_SYNC_SEQUENCE)
+        await conn.execute(BACKFILL_QUERY)
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE animals, animal_closure"))
+    logger.info(f"[Tree] Loaded {len(rows)} nodes.")
+    return len(rows)
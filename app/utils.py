@@ -1,5 +1,6 @@
-from typing import Any, Type, TypeVar
+from typing import Any, Iterable, Sequence, Type, TypeVar
 
+import orjson
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,3 +15,16 @@ async def get_or_404(db: AsyncSession, model: Type[T], pk: int) -> T:
             detail=f"{model.__name__} id={pk} not found.",
         )
     return obj
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive key for an animal name."""
+    return " ".join(name.split()).casefold()
+
+
+def rows_to_json(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> bytes:
+    """
+    Serializes result rows as a JSON array of objects in one orjson call.
+    Only for JSON-native columns: no Pydantic validation happens here.
+    """
+    return orjson.dumps([dict(zip(keys, row)) for row in rows])
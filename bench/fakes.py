@@ -0,0 +1,116 @@
+"""
+In-process stand-ins for API Ninjas, Unsplash and Gemini.
+
+Every fake has a fixed latency plus jitter and an error rate, drawn from
+a seeded RNG so runs are repeatable. Taxonomies are derived from a hash
+of the name, so the same name always lands in the same clade and a few
+thousand names still share realistic genus/family/order prefixes.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+
+import httpx
+
+_PHYLA = ["Chordata", "Arthropoda", "Mollusca", "Cnidaria", "Annelida"]
+_SYLLABLES = ["ra", "ko", "mi", "ta", "lu", "ne", "so", "vi", "da", "pe", "zu", "fa", "gri", "ol", "en"]
+
+
+def synthetic_names(count: int, offset: int = 0) -> list[str]:
+    """Deterministic, unique pseudo-species names ("Rakomi Tasolu 0042")."""
+    names = []
+    for n in range(offset, offset + count):
+        rng = random.Random(n)
+        word = lambda k: "".join(rng.choice(_SYLLABLES) for _ in range(k)).capitalize()
+        names.append(f"{word(3)} {word(2)} {n:05d}")
+    return names
+
+
+def synthetic_taxonomy(name: str) -> dict[str, str]:
+    # Each level is derived from the one below, so every genus has exactly
+    # one family, every family one order, and so on — a consistent tree.
+    genus = int(hashlib.sha1(name.lower().encode()).hexdigest(), 16) % 600
+    family, order = genus // 4, genus // 16
+    klass = order // 4
+    phylum = _PHYLA[klass % len(_PHYLA)]
+    return {
+        "kingdom": "Animalia",
+        "phylum": phylum,
+        "class": f"Class {klass}",
+        "order": f"Order {order}",
+        "family": f"Family {family}",
+        "genus": f"Genus {genus}",
+        "scientific_name": f"Genus{genus} {name.split()[0].lower()}",
+    }
+
+
+@dataclass
+class FakeProfile:
+    latency: float = 0.05      # seconds per call
+    jitter: float = 0.02       # uniform extra delay, seconds
+    error_rate: float = 0.0    # fraction of calls answered with HTTP 503 / an exception
+    seed: int = 0
+
+
+class FakeUpstreams:
+    """API Ninjas + Unsplash behind one `httpx.MockTransport`."""
+
+    def __init__(self, profile: FakeProfile) -> None:
+        self.profile = profile
+        self.calls: dict[str, int] = {"api_ninjas": 0, "unsplash": 0}
+        self._rng = random.Random(profile.seed)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.profile.latency + self._rng.uniform(0, self.profile.jitter))
+        if self._rng.random() < self.profile.error_rate:
+            return httpx.Response(503, json={"error": "injected"})
+
+        if request.url.host == "api.api-ninjas.com":
+            self.calls["api_ninjas"] += 1
+            name = request.url.params.get("name", "")
+            return httpx.Response(200, json=[{
+                "name": name,
+                "taxonomy": synthetic_taxonomy(name),
+                "locations": ["Benchland"],
+                "characteristics": {"lifespan": "10 years", "weight": "5 kg", "temperament": "calm"},
+            }])
+        if request.url.host == "api.unsplash.com":
+            self.calls["unsplash"] += 1
+            query = request.url.params.get("query", "")
+            slug = hashlib.md5(query.encode()).hexdigest()[:12]
+            return httpx.Response(200, json={"results": [{"urls": {"regular": f"https://images.example/{slug}.jpg"}}]})
+        return httpx.Response(404)
+
+
+class FakeGemini:
+    """
+    Duck-types the `client.aio.models.generate_content` surface used by
+    `app.services.ai_service`. JSON-mode (batch) prompts get one entry per
+    "- id N:" line.
+    """
+
+    _ID_LINE = re.compile(r"^- id (\d+):", re.MULTILINE)
+
+    def __init__(self, profile: FakeProfile) -> None:
+        self.profile = profile
+        self.calls = 0
+        self._rng = random.Random(profile.seed + 1)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self.generate_content))
+
+    async def generate_content(self, model: str, contents: str, config: Optional[dict] = None):
+        self.calls += 1
+        await asyncio.sleep(self.profile.latency + self._rng.uniform(0, self.profile.jitter))
+        if self._rng.random() < self.profile.error_rate:
+            raise RuntimeError("injected Gemini failure")
+        if config and config.get("response_mime_type") == "application/json":
+            facts = {animal_id: "A synthetic benchmark fact." for animal_id in self._ID_LINE.findall(contents)}
+            return SimpleNamespace(text=json.dumps(facts))
+        return SimpleNamespace(text="A synthetic benchmark fact.")
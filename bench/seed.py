@@ -0,0 +1,64 @@
+"""Loads a synthetic tree of `size` species straight into Postgres."""
+import logging
+
+from sqlalchemy import insert, text
+
+from app.db.closure import BACKFILL_QUERY
+from app.db.database import engine
+from app.db.models import Animal
+from bench.fakes import synthetic_names, synthetic_taxonomy
+
+logger = logging.getLogger(__name__)
+
+_LEVELS = ["kingdom", "phylum", "class", "order", "family", "genus"]
+
+_RESET = text(
+    "TRUNCATE animals, animal_closure, enrichment_jobs, external_api_cache RESTART IDENTITY CASCADE"
+)
+_SYNC_SEQUENCE = text("SELECT setval(pg_get_serial_sequence('animals', 'id'), max(id)) FROM animals")
+
+
+def build_rows(size: int) -> tuple[list[dict], list[dict]]:
+    """Taxa first, then species, with explicit ids so parents resolve in memory."""
+    taxa: dict[str, int] = {}
+    taxon_rows: list[dict] = []
+    species_rows: list[dict] = []
+    for name in synthetic_names(size):
+        taxonomy = synthetic_taxonomy(name)
+        parent_id = None
+        for level in _LEVELS:
+            taxon = taxonomy[level]
+            if taxon not in taxa:
+                taxa[taxon] = len(taxa) + 1
+                taxon_rows.append({"id": taxa[taxon], "name": taxon, "ancestor_id": parent_id})
+            parent_id = taxa[taxon]
+        species_rows.append({
+            "name": name,
+            "ancestor_id": parent_id,
+            "scientific_name": taxonomy["scientific_name"],
+            "taxonomy_class": taxonomy["class"],
+            "locations": "Benchland",
+            "lifespan": "10 years",
+            "weight": "5 kg",
+        })
+    for offset, row in enumerate(species_rows, start=len(taxa) + 1):
+        row["id"] = offset
+    return taxon_rows, species_rows
+
+
+async def seed(size: int, chunk_size: int = 5000) -> list[int]:
+    """Replaces every table's contents; returns the species ids."""
+    taxon_rows, species_rows = build_rows(size)
+    async with engine.begin() as conn:
+        await conn.execute(_RESET)
+        # Executemany needs uniform keys, so the two row shapes go separately.
+        for rows in (taxon_rows, species_rows):
+            for start in range(0, len(rows), chunk_size):
+                await conn.execute(insert(Animal), rows[start:start + chunk_size])
+        await conn.execute(_SYNC_SEQUENCE)
+        await conn.execute(BACKFILL_QUERY)
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE animals, animal_closure"))
+    logger.info(f"[Bench] Seeded {len(taxon_rows) + len(species_rows)} rows ({size} species).")
+    return [row["id"] for row in species_rows]
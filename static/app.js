@@ -29,19 +29,8 @@ const TAXON_STYLE = {
 
 // ── Vis.js NETWORK OPTIONS ────────────────────────────────────────────────
 const NETWORK_OPTIONS = {
-    layout: {
-        hierarchical: {
-            enabled: true,
-            direction: "UD",
-            sortMethod: "directed",
-            levelSeparation: 150,
-            nodeSpacing: 180,
-            treeSpacing: 220,
-            blockShifting: true,
-            edgeMinimization: true,
-            parentCentralization: true,
-        },
-    },
+    // Coordinates come precomputed from /animals/graph/layout.
+    layout: { hierarchical: { enabled: false }, improvedLayout: false },
     physics: { enabled: false },
     nodes: {
         shape: "dot",
@@ -89,61 +78,83 @@ function emojiForAnimal(name = "") {
     return "🐾";
 }
 
-// ── DATA → VIS.JS CONVERSION ──────────────────────────────────────────────
-function buildGraphData(animals) {
-    const nodes = animals.map(a => {
-        const cc = classColor(a.taxonomy_class);
-        const hasImage = !!a.image_url;
-
-        let nodeStyle;
-
-        if (hasImage) {
-            nodeStyle = {
-                shape: "circularImage",
-                image: a.image_url,
-                size: 36,
-                color: {
-                    border: cc ? cc.border : "#3fb950",
-                    background: "#161b22",
-                    highlight: { border: cc ? cc.border : "#56d364", background: "#21262d" },
-                },
-                shadow: cc
-                    ? { enabled: true, color: cc.glow, x: 0, y: 0, size: 20 }
-                    : { enabled: true, color: "rgba(63,185,80,.25)", x: 0, y: 0, size: 16 },
-                font: { color: "#e6edf3", size: 13, face: "Roboto, system-ui", bold: true },
-            };
-        } else {
-            nodeStyle = { ...TAXON_STYLE };
-            if (cc) {
-                nodeStyle.color = {
-                    background: "#21262d",
-                    border: cc.border,
-                    highlight: { background: "#30363d", border: cc.border },
-                };
-                nodeStyle.shadow = { enabled: true, color: cc.glow, x: 0, y: 0, size: 10 };
-            }
-        }
+// ── SPECIES (leaf) STYLE before details are loaded ─────────────────────────
+const SPECIES_STYLE = {
+    shape: "dot",
+    size: 20,
+    color: {
+        background: "#161b22", border: "#3fb950",
+        highlight: { background: "#21262d", border: "#56d364" }
+    },
+    shadow: { enabled: true, color: "rgba(63,185,80,.25)", x: 0, y: 0, size: 16 },
+};
+
+// ── ANIMAL DETAILS → NODE STYLE ───────────────────────────────────────────
+function nodeStyleFor(a) {
+    const cc = classColor(a.taxonomy_class);
 
+    if (a.image_url) {
         return {
-            id: a.id,
-            label: a.name,
-            title: a.scientific_name ?? "",
-            ...nodeStyle,
-            _data: a,
+            shape: "circularImage",
+            image: a.image_url,
+            size: 36,
+            color: {
+                border: cc ? cc.border : "#3fb950",
+                background: "#161b22",
+                highlight: { border: cc ? cc.border : "#56d364", background: "#21262d" },
+            },
+            shadow: cc
+                ? { enabled: true, color: cc.glow, x: 0, y: 0, size: 20 }
+                : { enabled: true, color: "rgba(63,185,80,.25)", x: 0, y: 0, size: 16 },
+            font: { color: "#e6edf3", size: 13, face: "Roboto, system-ui", bold: true },
         };
-    });
+    }
+
+    const nodeStyle = { ...TAXON_STYLE };
+    if (cc) {
+        nodeStyle.color = {
+            background: "#21262d",
+            border: cc.border,
+            highlight: { background: "#30363d", border: cc.border },
+        };
+        nodeStyle.shadow = { enabled: true, color: cc.glow, x: 0, y: 0, size: 10 };
+    }
+    return nodeStyle;
+}
 
-    const edges = animals
-        .filter(a => a.ancestor_id !== null && a.ancestor_id !== undefined)
-        .map(a => ({
-            from: a.ancestor_id,
-            to: a.id,
-            id: `e-${a.ancestor_id}-${a.id}`,
-        }));
+// ── COMPACT GRAPH → VIS.JS CONVERSION ─────────────────────────────────────
+function buildGraphData(graph, layout) {
+    const coords = new Map(layout.ids.map((id, i) => [id, { x: layout.x[i], y: layout.y[i] }]));
+    const nodes = graph.ids.map((id, i) => ({
+        id,
+        label: graph.names[i],
+        ...coords.get(id),
+        ...(graph.is_leaf[i] ? SPECIES_STYLE : TAXON_STYLE),
+    }));
+
+    const edges = [];
+    graph.ids.forEach((id, i) => {
+        const parent = graph.ancestor_ids[i];
+        if (parent !== null && parent !== undefined) {
+            edges.push({ from: parent, to: id, id: `e-${parent}-${id}` });
+        }
+    });
 
     return { nodes, edges };
 }
 
+// ── LAZY DETAILS (fetched when a node's panel opens) ───────────────────────
+const detailsCache = new Map();
+
+async function fetchAnimal(id) {
+    if (detailsCache.has(id)) return detailsCache.get(id);
+    const res = await fetch(`/animals/${id}`);
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const animal = await res.json();
+    detailsCache.set(id, animal);
+    return animal;
+}
+
 // ── INFO PANEL ──────────────────────────────────────────────────────────
 const panel = document.getElementById("info-panel");
 const closeBtn = document.getElementById("close-btn");
@@ -193,34 +204,40 @@ const deleteBtn = document.getElementById("delete-btn");
 deleteBtn.addEventListener("click", async () => {
     if (!activePanelAnimalId) return;
     const name = document.getElementById("panel-name").textContent;
-    if (!confirm(`Delete "${name}"?\nDescendants will not be deleted, their links will be broken.`)) return;
+    if (!confirm(`Delete "${name}"?\nIts descendants will be attached to its parent.`)) return;
     try {
-        const res = await fetch(`/animals/${activePanelAnimalId}`, { method: "DELETE" });
+        const res = await fetch(`/animals/${activePanelAnimalId}?mode=reparent`, { method: "DELETE" });
         if (!res.ok && res.status !== 204) { alert("Delete error: " + res.status); return; }
         hidePanel();
-        await init();
+        if (!eventsLive()) await init();  // otherwise the "deleted" event patches the graph
     } catch (err) { alert("Connection error: " + err.message); }
 });
 
 // ── MAIN INIT ─────────────────────────────────────────────────────────
 const loader = document.getElementById("loader");
+let graphView = null;  // { network, nodeSet, edgeSet } once the tree is drawn
 
 async function init() {
-    let animals;
+    let graph, layout;
     try {
-        const res = await fetch("/animals/");
-        if (!res.ok) throw new Error(`HTTP ${res.status}`);
-        animals = await res.json();
+        const [graphRes, layoutRes] = await Promise.all([
+            fetch("/animals/graph", { cache: "no-cache" }),
+            fetch("/animals/graph/layout", { cache: "no-cache" }),
+        ]);
+        if (!graphRes.ok) throw new Error(`HTTP ${graphRes.status}`);
+        if (!layoutRes.ok) throw new Error(`HTTP ${layoutRes.status}`);
+        [graph, layout] = await Promise.all([graphRes.json(), layoutRes.json()]);
     } catch (err) {
         loader.querySelector("p").textContent = "❌ Failed to fetch data: " + err.message;
         return;
     }
 
-    const edgeCount = animals.filter(a => a.ancestor_id !== null).length;
-    document.getElementById("stat-nodes").textContent = `${animals.length} species`;
+    detailsCache.clear();
+    const edgeCount = graph.ancestor_ids.filter(p => p !== null).length;
+    document.getElementById("stat-nodes").textContent = `${graph.ids.length} species`;
     document.getElementById("stat-edges").textContent = `${edgeCount} links`;
 
-    if (animals.length === 0) {
+    if (graph.ids.length === 0) {
         loader.classList.add("done");
 
         const container = document.getElementById("network");
@@ -235,7 +252,7 @@ async function init() {
         return;
     }
 
-    const { nodes, edges } = buildGraphData(animals);
+    const { nodes, edges } = buildGraphData(graph, layout);
     const nodeSet = new vis.DataSet(nodes);
     const edgeSet = new vis.DataSet(edges);
 
@@ -246,18 +263,107 @@ async function init() {
         NETWORK_OPTIONS
     );
 
-    network.on("click", ({ nodes: clicked }) => {
+    network.on("click", async ({ nodes: clicked }) => {
         if (clicked.length === 0) { hidePanel(); return; }
-        const node = nodeSet.get(clicked[0]);
-        if (node?._data) showPanel(node._data);
+        try {
+            const animal = await fetchAnimal(clicked[0]);
+            nodeSet.update({ id: animal.id, ...nodeStyleFor(animal) });
+            showPanel(animal);
+        } catch (err) { alert("Failed to load details: " + err.message); }
     });
     network.on("hoverNode", () => { container.style.cursor = "pointer"; });
     network.on("blurNode", () => { container.style.cursor = "default"; });
 
+    graphView = { network, nodeSet, edgeSet };
     loader.classList.add("done");
 }
 
-init();
+// ── LIVE UPDATES (SERVER-SENT EVENTS) ────────────────────────────────────
+let events = null;
+let layoutTimer = null;
+
+const eventsLive = () => events !== null && events.readyState === EventSource.OPEN;
+const panelShows = id => id === activePanelAnimalId && !panel.classList.contains("hidden");
+
+function updateStats() {
+    document.getElementById("stat-nodes").textContent = `${graphView.nodeSet.length} species`;
+    document.getElementById("stat-edges").textContent = `${graphView.edgeSet.length} links`;
+}
+
+// Adding or removing a node shifts its neighbours too, so positions are refetched (debounced).
+function refreshLayout() {
+    clearTimeout(layoutTimer);
+    layoutTimer = setTimeout(async () => {
+        if (!graphView) return;
+        try {
+            const res = await fetch("/animals/graph/layout", { cache: "no-cache" });
+            if (!res.ok) return;
+            const layout = await res.json();
+            const { nodeSet } = graphView;
+            nodeSet.update(layout.ids
+                .map((id, i) => ({ id, x: layout.x[i], y: layout.y[i] }))
+                .filter(p => nodeSet.get(p.id) !== null));
+        } catch (err) { console.warn("Layout refresh failed:", err); }
+    }, 250);
+}
+
+const EVENT_HANDLERS = {
+    added({ nodes }) {
+        if (!graphView) { init(); return; }
+        graphView.nodeSet.update(nodes.map(n => ({
+            id: n.id,
+            label: n.name,
+            ...(n.is_leaf ? SPECIES_STYLE : TAXON_STYLE),
+        })));
+        graphView.edgeSet.update(nodes
+            .filter(n => n.ancestor_id !== null)
+            .map(n => ({ id: `e-${n.ancestor_id}-${n.id}`, from: n.ancestor_id, to: n.id })));
+        nodes.forEach(n => detailsCache.delete(n.id));
+        updateStats();
+        refreshLayout();
+    },
+    deleted({ ids, reparented }) {
+        if (!graphView) return;
+        const gone = new Set(ids);
+        const { nodeSet, edgeSet } = graphView;
+        nodeSet.remove(ids);
+        edgeSet.remove(edgeSet.getIds({ filter: e => gone.has(e.from) || gone.has(e.to) }));
+        edgeSet.update(reparented
+            .filter(([, parent]) => parent !== null)
+            .map(([child, parent]) => ({ id: `e-${parent}-${child}`, from: parent, to: child })));
+        ids.forEach(id => detailsCache.delete(id));
+        if (gone.has(activePanelAnimalId)) hidePanel();
+        if (nodeSet.length === 0) { init(); return; }
+        updateStats();
+        refreshLayout();
+    },
+    fun_fact({ animals }) {
+        animals.forEach(({ id, fun_fact }) => {
+            const cached = detailsCache.get(id);
+            if (cached) cached.fun_fact = fun_fact;
+            if (panelShows(id)) document.getElementById("panel-funfact").textContent = fun_fact;
+        });
+    },
+    image({ id, image_url }) {
+        const cached = detailsCache.get(id);
+        if (!cached) return;  // the node picks up its photo when it is first opened
+        cached.image_url = image_url;
+        graphView?.nodeSet.update({ id, ...nodeStyleFor(cached) });
+        if (panelShows(id)) showPanel(cached);
+    },
+    reset() { init(); },
+};
+
+// EventSource reconnects by itself and resends the last event id, so missed events are replayed.
+function connectEvents() {
+    if (events || !window.EventSource) return;
+    events = new EventSource("/animals/events");
+    for (const [kind, handle] of Object.entries(EVENT_HANDLERS)) {
+        events.addEventListener(kind, e => handle(JSON.parse(e.data)));
+    }
+}
+
+init().then(connectEvents);
 
 // ── ADD ANIMAL MODAL ─────────────────────────────────────────────────────
 const modalOverlay = document.getElementById("modal-overlay");
@@ -300,7 +406,7 @@ async function submitAnimal() {
             showModalStatus("error", `❌ Error: ${data.detail ?? "HTTP " + res.status}`);
         } else {
             showModalStatus("success", `✅ ${data.background_task_status ?? data.animal.name + " added!"}`);
-            setTimeout(() => { init(); closeModal(); }, 2000);
+            setTimeout(() => { if (!eventsLive()) init(); closeModal(); }, 2000);
         }
     } catch (err) {
         showModalStatus("error", `❌ Connection error: ${err.message}`);
@@ -327,7 +433,7 @@ const lcaResult = document.getElementById("lca-result");
 
 
 async function populateLcaSelects() {
-    const res = await fetch("/animals/");
+    const res = await fetch("/animals/?fields=name,scientific_name");
     if (!res.ok) return;
     const all = await res.json();
 
@@ -403,3 +509,59 @@ lcaSubmit.addEventListener("click", async () => {
     }
 });
 
+
+
+// ── SEARCH ───────────────────────────────────────────────────────────────
+const searchInput = document.getElementById("search-input");
+const searchResults = document.getElementById("search-results");
+let searchTimer = null;
+let searchSeq = 0;
+
+async function runSearch(query) {
+    const seq = ++searchSeq;
+    if (!query.trim()) { searchResults.classList.add("hidden"); return; }
+    try {
+        const res = await fetch(`/animals/search?q=${encodeURIComponent(query)}&limit=8`);
+        if (!res.ok || seq !== searchSeq) return;
+        const { results } = await res.json();
+        searchResults.innerHTML = "";
+        if (results.length === 0) {
+            searchResults.innerHTML = `<li class="search-empty">No matches</li>`;
+        }
+        results.forEach(hit => {
+            const li = document.createElement("li");
+            li.textContent = hit.name;
+            if (hit.scientific_name) {
+                const sci = document.createElement("span");
+                sci.className = "search-sci";
+                sci.textContent = hit.scientific_name;
+                li.appendChild(sci);
+            }
+            li.addEventListener("mousedown", () => focusAnimal(hit.id));
+            searchResults.appendChild(li);
+        });
+        searchResults.classList.remove("hidden");
+    } catch (err) { console.warn("Search failed:", err); }
+}
+
+async function focusAnimal(id) {
+    searchResults.classList.add("hidden");
+    searchInput.value = "";
+    if (!graphView) return;
+    graphView.network.selectNodes([id]);
+    graphView.network.focus(id, { scale: 1.2, animation: { duration: 500 } });
+    try {
+        const animal = await fetchAnimal(id);
+        graphView.nodeSet.update({ id: animal.id, ...nodeStyleFor(animal) });
+        showPanel(animal);
+    } catch (err) { alert("Failed to load details: " + err.message); }
+}
+
+searchInput.addEventListener("input", () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => runSearch(searchInput.value), 150);
+});
+searchInput.addEventListener("blur", () => searchResults.classList.add("hidden"));
+searchInput.addEventListener("keydown", e => {
+    if (e.key === "Escape") { searchInput.value = ""; searchResults.classList.add("hidden"); }
+});
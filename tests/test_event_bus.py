@@ -0,0 +1,85 @@
+import asyncio
+from typing import Optional
+
+from app.services.event_bus import EventBus
+
+
+def _events(frames: list[bytes]) -> list[tuple[str, str]]:
+    """(id, event) of each data frame; retry and heartbeat lines are skipped."""
+    events = []
+    for frame in frames:
+        fields = dict(line.split(": ", 1) for line in frame.decode().splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["id"], fields["event"]))
+    return events
+
+
+async def _read(bus: EventBus, last_event_id: Optional[str], count: int) -> list[bytes]:
+    frames = []
+    stream = bus.stream(last_event_id, heartbeat=1.0)
+    async for frame in stream:
+        frames.append(frame)
+        if len(frames) == count:
+            break
+    await stream.aclose()
+    return frames
+
+
+def _bus_with(events: int, buffer_size: int = 3) -> EventBus:
+    bus = EventBus(buffer_size=buffer_size, queue_size=10)
+    for i in range(events):
+        bus.publish("added", nodes=[i])
+    return bus
+
+
+def test_reconnect_replays_missed_events():
+    bus = _bus_with(5)
+
+    frames = asyncio.run(_read(bus, f"{bus.epoch}-3", 3))
+
+    assert frames[0].startswith(b"retry: ")
+    assert _events(frames) == [(f"{bus.epoch}-4", "added"), (f"{bus.epoch}-5", "added")]
+
+
+def test_reset_when_the_gap_is_no_longer_buffered():
+    bus = _bus_with(5)
+
+    assert _events(asyncio.run(_read(bus, f"{bus.epoch}-1", 2))) == [(f"{bus.epoch}-5", "reset")]
+
+
+def test_reset_for_ids_from_another_process_or_unparseable():
+    bus = _bus_with(2)
+    other = EventBus(buffer_size=3, queue_size=10)
+
+    for last_event_id in (f"{other.epoch}-1", "1", "garbage", f"{bus.epoch}-9"):
+        assert _events(asyncio.run(_read(bus, last_event_id, 2))) == [(f"{bus.epoch}-2", "reset")]
+
+
+def test_live_events_follow_the_replay():
+    async def run() -> list[bytes]:
+        bus = _bus_with(1)
+        reader = asyncio.create_task(_read(bus, None, 3))
+        while not len(bus):
+            await asyncio.sleep(0)
+        bus.publish("image", id=1, image_url="x")
+        bus.publish("deleted", ids=[1], reparented=[])
+        return await reader
+
+    events = _events(asyncio.run(run()))
+
+    assert [kind for _, kind in events] == ["image", "deleted"]
+
+
+def test_slow_subscriber_is_dropped():
+    async def run() -> list[bytes]:
+        bus = EventBus(buffer_size=100, queue_size=2)
+        stream = bus.stream(None, heartbeat=1.0)
+        frames = [await stream.__anext__()]
+        for i in range(5):
+            bus.publish("added", nodes=[i])
+        async for frame in stream:
+            frames.append(frame)
+        assert not len(bus)
+        return frames
+
+    assert _events(asyncio.run(run())) == []
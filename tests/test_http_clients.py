@@ -0,0 +1,145 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import http_clients as http_clients_module
+from app.services.http_clients import HttpClientRegistry, ServiceConfig
+
+_real_sleep = asyncio.sleep
+
+
+def _registry(handler, retries: int = 2, concurrency: int = 4) -> HttpClientRegistry:
+    config = ServiceConfig(timeout=1.0, max_connections=4, concurrency=concurrency, retries=retries, backoff=0.5)
+    registry = HttpClientRegistry({"test": config})
+    registry._transport = httpx.MockTransport(handler)
+    return registry
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records backoff delays instead of sleeping through them."""
+    delays: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+        await _real_sleep(0)
+
+    monkeypatch.setattr(http_clients_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def _replies(*responses):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        reply = responses[len(calls)]
+        calls.append(request)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    return handler, calls
+
+
+def test_retries_retryable_statuses_with_exponential_backoff(sleeps):
+    handler, calls = _replies(httpx.Response(503), httpx.Response(500), httpx.Response(200, json={"ok": True}))
+    registry = _registry(handler)
+
+    response = asyncio.run(registry.get("test", "https://example.test/x"))
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_non_retryable_status_is_returned_immediately(sleeps):
+    handler, calls = _replies(httpx.Response(404))
+    registry = _registry(handler)
+
+    response = asyncio.run(registry.get("test", "https://example.test/x"))
+
+    assert response.status_code == 404
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_last_response_is_returned_when_retries_run_out(sleeps):
+    handler, calls = _replies(httpx.Response(502), httpx.Response(502), httpx.Response(429))
+    registry = _registry(handler)
+
+    response = asyncio.run(registry.get("test", "https://example.test/x"))
+
+    assert response.status_code == 429
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("retry_after, expected", [("3", 3.0), ("0", 0.5), ("120", 30.0), ("soon", 0.5)])
+def test_retry_after_stretches_the_backoff_up_to_a_cap(sleeps, retry_after, expected):
+    handler, _ = _replies(httpx.Response(429, headers={"Retry-After": retry_after}), httpx.Response(200))
+    registry = _registry(handler)
+
+    asyncio.run(registry.get("test", "https://example.test/x"))
+
+    assert sleeps == [expected]
+
+
+def test_transport_errors_are_retried_then_raised(sleeps):
+    error = httpx.ConnectError("refused")
+    handler, calls = _replies(error, error, error)
+    registry = _registry(handler)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(registry.get("test", "https://example.test/x"))
+    assert len(calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_concurrency_cap_limits_requests_in_flight():
+    in_flight, peak = 0, 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await _real_sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    registry = _registry(handler, concurrency=2)
+
+    async def run() -> None:
+        await asyncio.gather(*(registry.get("test", f"https://example.test/{i}") for i in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_backoff_sleep_does_not_hold_the_concurrency_slot(monkeypatch):
+    backing_off, resume = None, None
+
+    async def fake_sleep(delay: float) -> None:
+        backing_off.set()
+        await resume.wait()
+
+    monkeypatch.setattr(http_clients_module.asyncio, "sleep", fake_sleep)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/slow" and not backing_off.is_set():
+            return httpx.Response(503)
+        return httpx.Response(200)
+
+    registry = _registry(handler, concurrency=1)
+
+    async def run() -> None:
+        nonlocal backing_off, resume
+        backing_off, resume = asyncio.Event(), asyncio.Event()
+        slow = asyncio.create_task(registry.get("test", "https://example.test/slow"))
+        await backing_off.wait()
+        # With the only slot held during the backoff this would hang.
+        fast = await asyncio.wait_for(registry.get("test", "https://example.test/fast"), 1.0)
+        assert fast.status_code == 200
+        resume.set()
+        assert (await slow).status_code == 200
+
+    asyncio.run(run())
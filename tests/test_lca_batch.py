@@ -0,0 +1,77 @@
+import random
+
+import numpy as np
+import orjson
+import pytest
+
+from app.api.routes import _encode_lca_batch
+from app.schemas.animal import LCABatchMatrixResponse, LCABatchPairsResponse
+from app.services.taxonomy_index import TaxonomyIndex, pairwise_lca
+
+
+def _index(seed: int) -> TaxonomyIndex:
+    rng = random.Random(seed)
+    index = TaxonomyIndex()
+    index.load((node_id, None if node_id <= 3 else rng.randint(1, node_id - 1)) for node_id in range(1, 401))
+    return index
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lca_matrix_matches_scalar_queries(seed):
+    index = _index(seed)
+    ids = random.Random(seed).sample(range(1, 401), 60)
+
+    lca, dist = index.lca_matrix(ids)
+
+    for i, a in enumerate(ids):
+        for j, b in enumerate(ids):
+            expected = index.distances(a, b)
+            if expected is None:
+                assert (lca[i, j], dist[i, j]) == (-1, -1)
+            else:
+                ancestor, up, down = expected
+                assert (lca[i, j], dist[i, j]) == (ancestor, up + down)
+
+
+def test_lca_inputs_are_unaffected_by_later_mutations():
+    index = _index(1)
+    ids = [4, 10, 200, 399]
+    expected = index.lca_matrix(ids)
+    inputs = index.lca_inputs(ids)
+
+    for node_id in range(401, 1401):
+        index.add(node_id, node_id - 1)
+    index.remove(1)
+
+    lca, dist = pairwise_lca(*inputs)
+    assert (lca == expected[0]).all() and (dist == expected[1]).all()
+
+
+def test_encoded_matrix_and_pairs_match_the_schemas():
+    index = _index(0)
+    ids = [1, 2, 50, 120, 399]
+    lca, dist = index.lca_matrix(ids)
+
+    matrix = LCABatchMatrixResponse.model_validate_json(_encode_lca_batch(ids, lca, dist, "matrix"))
+    assert matrix.common_ancestor_ids == lca.tolist()
+    assert matrix.distances == dist.tolist()
+
+    pairs = LCABatchPairsResponse.model_validate_json(_encode_lca_batch(ids, lca, dist, "pairs"))
+    assert len(pairs.pairs) == len(ids) * (len(ids) - 1) // 2
+    for pair in pairs.pairs:
+        expected = index.distances(pair.animal1_id, pair.animal2_id)
+        if expected is None:
+            assert pair.common_ancestor_id is None and pair.total_distance is None
+        else:
+            assert (pair.common_ancestor_id, pair.total_distance) == (expected[0], expected[1] + expected[2])
+
+
+def test_unrelated_pairs_encode_as_null():
+    lca = np.array([[1, -1], [-1, 2]], dtype=np.int64)
+    dist = np.array([[0, -1], [-1, 0]], dtype=np.int64)
+
+    body = orjson.loads(_encode_lca_batch([1, 2], lca, dist, "pairs"))
+
+    assert body == {"pairs": [
+        {"animal1_id": 1, "animal2_id": 2, "common_ancestor_id": None, "total_distance": None},
+    ]}
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from app.services.name_index import NameIndex
+from app.services.relatives import RelativesIndex
+from app.services.taxonomy_index import TaxonomyIndex
+
+
+def _brute_force(tree: TaxonomyIndex, names: NameIndex, node_id: int, k: int, max_distance):
+    ranked = []
+    for species_id in names.species_ids():
+        if species_id == node_id or species_id not in tree:
+            continue
+        distances = tree.distances(node_id, species_id)
+        if distances is None:
+            continue
+        ancestor, up, down = distances
+        if max_distance is not None and up + down > max_distance:
+            continue
+        ranked.append((up + down, -tree.depth(ancestor), species_id, ancestor, up, down))
+    ranked.sort()
+    return [(species_id, ancestor, up, down) for _, _, species_id, ancestor, up, down in ranked[:k]]
+
+
+def _query(relatives: RelativesIndex, node_id: int, k: int, max_distance):
+    return [
+        (r.id, r.common_ancestor_id, r.animal_distance, r.relative_distance)
+        for r in relatives.nearest(node_id, k, max_distance)
+    ]
+
+
+def _random_forest(rng: random.Random, n: int):
+    tree, names = TaxonomyIndex(), NameIndex()
+    tree.load([(i, rng.randint(1, i - 1) if i > 1 and rng.random() < 0.9 else None) for i in range(1, n + 1)])
+    names.load([(i, f"n{i}", f"s{i}" if rng.random() < 0.6 else None) for i in range(1, n + 1)])
+    return tree, names
+
+
+def test_ranks_by_distance_then_deeper_ancestor():
+    tree, names = TaxonomyIndex(), NameIndex()
+    tree.load([(1, None), (2, 1), (3, 1), (4, 2), (5, 2), (6, 3), (7, 4), (8, None)])
+    names.load([
+        (1, "Chordata", None), (2, "Felidae", None), (3, "Canidae", None), (4, "Panthera", None),
+        (5, "Cat", "Felis catus"), (6, "Wolf", "Canis lupus"), (7, "Lion", "Panthera leo"),
+        (8, "Oak", "Quercus robur"),
+    ])
+    relatives = RelativesIndex(tree, names)
+
+    assert _query(relatives, 7, 10, None) == [(5, 2, 2, 1), (6, 1, 3, 2)]
+    assert _query(relatives, 7, 10, 3) == [(5, 2, 2, 1)]
+    assert _query(relatives, 7, 1, None) == [(5, 2, 2, 1)]
+    assert _query(relatives, 8, 10, None) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_updates_match_brute_force(seed):
+    rng = random.Random(seed)
+    tree, names = _random_forest(rng, rng.randint(1, 60))
+    relatives = RelativesIndex(tree, names)
+    computes = 0
+    original = relatives._compute
+
+    def counted():
+        nonlocal computes
+        computes += 1
+        original()
+
+    relatives._compute = counted
+    next_id = len(tree) + 1
+    for _ in range(40):
+        live = [node_id for node_id in range(1, next_id) if node_id in tree]
+        op = rng.random()
+        if op < 0.4 or not live:
+            tree.add(next_id, rng.choice(live) if live and rng.random() < 0.9 else None)
+            if rng.random() < 0.7:
+                names.add(next_id, f"n{next_id}", f"s{next_id}" if rng.random() < 0.7 else None)
+            next_id += 1
+        elif op < 0.5:
+            node_id = rng.choice(live)
+            names.add(node_id, f"n{node_id}", f"s{node_id}" if rng.random() < 0.7 else None)
+        elif op < 0.6:
+            node_id = rng.choice(live)
+            tree.remove(node_id)
+            names.remove(node_id)
+        elif op < 0.7:
+            node_id = rng.choice(live)
+            tree.remove(node_id, reparent=True)
+            names.remove(node_id)
+        elif op < 0.75:
+            node_id = rng.choice(live)
+            removed = tree.subtree(node_id)
+            tree.remove_subtree(node_id)
+            for removed_id in removed:
+                names.remove(removed_id)
+
+        live = [node_id for node_id in range(1, next_id) if node_id in tree]
+        for node_id in rng.sample(live, min(3, len(live))):
+            k, max_distance = rng.randint(1, 30), rng.choice([None, 1, 2, 4])
+            assert _query(relatives, node_id, k, max_distance) == _brute_force(tree, names, node_id, k, max_distance)
+
+    # Everything after the first query was applied incrementally.
+    assert computes <= 1
@@ -0,0 +1,60 @@
+import pytest
+
+from app.core.config import settings
+from app.services.response_cache import (
+    clear_responses,
+    generation,
+    invalidate_animals,
+    response_cache,
+    store,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_responses()
+    yield
+    clear_responses()
+
+
+def test_fill_is_stored_when_nothing_changed():
+    fill_generation = generation(1)
+    store(("animal", 1), b"new", fill_generation)
+
+    assert response_cache.get(("animal", 1)) == b"new"
+
+
+def test_fill_racing_an_invalidation_is_dropped():
+    fill_generation = generation(1)
+    invalidate_animals([1])  # a write commits while the read is in flight
+    store(("lineage", 1), b"stale", fill_generation)
+
+    assert response_cache.get(("lineage", 1)) is None
+    store(("lineage", 1), b"fresh", generation(1))
+    assert response_cache.get(("lineage", 1)) == b"fresh"
+
+
+def test_invalidation_of_other_ids_does_not_block_the_fill():
+    fill_generation = generation(1)
+    invalidate_animals([2, 3])
+    store(("animal", 1), b"body", fill_generation)
+
+    assert response_cache.get(("animal", 1)) == b"body"
+
+
+def test_evicted_generations_still_drop_in_flight_fills(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_MAX_ENTRIES", 2)
+    fill_generation = generation(1)
+    invalidate_animals([1])
+    invalidate_animals([2, 3, 4])  # pushes id 1 out of the generation table
+    store(("animal", 1), b"stale", fill_generation)
+
+    assert response_cache.get(("animal", 1)) is None
+
+
+def test_clear_drops_in_flight_fills():
+    fill_generation = generation(1)
+    clear_responses()
+    store(("animal", 1), b"stale", fill_generation)
+
+    assert response_cache.get(("animal", 1)) is None
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from app.services.taxonomy_index import TaxonomyIndex
+
+
+def _random_forest(rng: random.Random, n: int, roots: int) -> dict:
+    parent = {}
+    for node_id in range(1, n + 1):
+        parent[node_id] = None if node_id <= roots else rng.randint(1, node_id - 1)
+    return parent
+
+
+def _path(parent: dict, node_id: int) -> list:
+    path = [node_id]
+    while parent[path[-1]] is not None:
+        path.append(parent[path[-1]])
+    return path
+
+
+def _brute_force(parent: dict, a: int, b: int):
+    """(lca, steps from a, steps from b) by walking both paths, or None."""
+    path_a, path_b = _path(parent, a), _path(parent, b)
+    on_b = {node_id: steps for steps, node_id in enumerate(path_b)}
+    for steps, node_id in enumerate(path_a):
+        if node_id in on_b:
+            return node_id, steps, on_b[node_id]
+    return None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_distances_match_brute_force(seed):
+    rng = random.Random(seed)
+    parent = _random_forest(rng, 300, roots=3)
+    index = TaxonomyIndex()
+    index.load(parent.items())
+
+    for _ in range(500):
+        a, b = rng.randint(1, 300), rng.randint(1, 300)
+        assert index.distances(a, b) == _brute_force(parent, a, b)
+
+
+def test_deep_chain():
+    index = TaxonomyIndex()
+    index.load([(1, None)] + [(i, i - 1) for i in range(2, 5001)])
+
+    assert index.distances(5000, 2500) == (2500, 2500, 0)
+    assert index.depth(5000) == 4999
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mutations_keep_queries_consistent(seed):
+    rng = random.Random(seed)
+    parent = _random_forest(rng, 200, roots=2)
+    index = TaxonomyIndex()
+    index.load(parent.items())
+    next_id = 201
+
+    for _ in range(60):
+        op = rng.random()
+        if op < 0.5 or not parent:
+            parent[next_id] = rng.choice(list(parent)) if parent else None
+            index.add(next_id, parent[next_id])
+            next_id += 1
+        elif op < 0.8:
+            node_id = rng.choice(list(parent))
+            reparent = rng.random() < 0.5
+            old_parent = parent.pop(node_id)
+            new_parent = old_parent if reparent else None
+            for child_id, child_parent in parent.items():
+                if child_parent == node_id:
+                    parent[child_id] = new_parent
+            index.remove(node_id, reparent=reparent)
+        else:
+            node_id = rng.choice(list(parent))
+            doomed = {n for n in parent if node_id in _path(parent, n)}
+            for n in doomed:
+                del parent[n]
+            index.remove_subtree(node_id)
+
+        assert len(index) == len(parent)
+        nodes = list(parent)
+        for _ in range(50 if nodes else 0):
+            a, b = rng.choice(nodes), rng.choice(nodes)
+            assert index.distances(a, b) == _brute_force(parent, a, b)
+
+
+def test_unknown_parent_marks_the_index_stale():
+    index = TaxonomyIndex()
+    index.load([(1, None), (2, 1)])
+    version = index.version
+
+    index.add(3, 99)
+
+    assert index.stale
+    assert 3 not in index
+    assert index.version == version
@@ -0,0 +1,76 @@
+import pytest
+
+from app.services.tree_io import decode_binary, encode_binary, newick_chunks, parse_newick, validate_tree
+
+_ROWS = [
+    (1, None, "Animalia", "Animalia"),
+    (2, 1, "Chordata", None),
+    (3, 2, "Homo sapiens", "Homo sapiens"),
+    (4, 2, "Bird's-eye (test), ok", None),
+    (5, 1, "Arthropoda", None),
+    (7, None, "Plantae", None),
+    (8, 7, "Café_flower", None),
+]
+
+
+def _newick(rows, chunk_chars: int = 1 << 16) -> str:
+    return "".join(newick_chunks(rows, chunk_chars))
+
+
+def _shape(rows) -> set:
+    """(name, parent name) pairs: Newick keeps structure and names, not ids."""
+    names = {node_id: name for node_id, _, name, _ in rows}
+    return {(name, names.get(parent_id)) for _, parent_id, name, _ in rows}
+
+
+def test_binary_round_trip():
+    assert decode_binary(encode_binary(_ROWS)) == _ROWS
+
+
+def test_binary_rejects_garbage_and_truncation():
+    with pytest.raises(ValueError):
+        decode_binary(b"nope")
+    with pytest.raises(ValueError):
+        decode_binary(encode_binary(_ROWS)[:-40])
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 7, 1 << 16])
+def test_newick_round_trip_keeps_structure_and_names(chunk_chars):
+    rows = parse_newick(_newick(_ROWS, chunk_chars))
+
+    assert _shape(rows) == _shape(_ROWS)
+    validate_tree(rows)
+
+
+def test_single_root_is_not_wrapped():
+    rows = [(1, None, "Root", None), (2, 1, "Leaf", None)]
+
+    assert _newick(rows) == "(Leaf)Root;\n"
+    assert _shape(parse_newick("(Leaf)Root;")) == _shape(rows)
+
+
+def test_parse_ignores_branch_lengths_and_comments_and_names_inner_nodes():
+    rows = parse_newick("((a:0.1,b:2e-3)[comment]:1,c)top;")
+
+    assert _shape(rows) == {
+        ("top", None), ("Unnamed clade 1", "top"), ("a", "Unnamed clade 1"),
+        ("b", "Unnamed clade 1"), ("c", "top"),
+    }
+
+
+@pytest.mark.parametrize("source", ["((a,b);", "(a,b));", "('a,b);", "(a[x,b);"])
+def test_parse_rejects_malformed_input(source):
+    with pytest.raises(ValueError):
+        parse_newick(source)
+
+
+@pytest.mark.parametrize("rows", [
+    [(1, None, "a", None), (1, None, "b", None)],
+    [(1, None, "a", None), (2, 1, "a", None)],
+    [(1, None, "a", None), (2, 9, "b", None)],
+    [(1, 2, "a", None), (2, 1, "b", None)],
+    [(1, None, "", None)],
+])
+def test_validate_rejects_bad_trees(rows):
+    with pytest.raises(ValueError):
+        validate_tree(rows)